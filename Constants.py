@@ -8,16 +8,77 @@ MAIN_AREA = 2
 # Amout of init Cards for every player_area
 INIT_CARDS = 6
 
+# A simulated game that takes more turns than this counts as a draw
+MAX_TURNS = 1000
+
+# Default hypotheses of the tournament test: H0 says the first strategy is SPRT_ELO0 stronger, H1 says SPRT_ELO1
+SPRT_ELO0 = 0
+SPRT_ELO1 = 50
+# The chances of a wrong decision, SPRT_ALPHA to accept H1 when H0 is true and SPRT_BETA the other way around
+SPRT_ALPHA = 0.05
+SPRT_BETA = 0.05
+# Standard errors on both sides of the Elo estimate, 1.96 gives a 95% confidence interval
+ELO_CONFIDENCE_Z = 1.96
+
 # How fast to move, and how fast to run the animation
 MOVEMENT_SPEED = 5
 UPDATES_PER_FRAME = 5
 
 ANIMATION_STEPS = 30
+# Seconds a card takes to move to its destination
+CARD_MOVE_DURATION = 0.5
+# Seconds between the updates of the window, and between the updates while nothing changes in the render-on-change mode
+UPDATE_RATE = 1 / 60
+IDLE_UPDATE_RATE = 1 / 5
 
 # Difficulties
 EASY = 0
 MEDIUM = 1
 HARD = 2
+EXPERT = 3
+
+# Seconds the expert computer may search for one move in simulated games
+ISMCTS_TIME_BUDGET = 0.01
+# Exploration constant of the expert search, higher values try more of the weaker looking moves
+ISMCTS_EXPLORATION = 0.7
+# The endgame solver starts once the talon is empty and at most this many cards are left in the hands and on the table
+ENDGAME_CARDS = 10
+# Seconds the endgame solver may search for one move before the strategy falls back to its rules
+ENDGAME_TIME_BUDGET = 0.2
+# Number of slots of the transposition table the searching strategies share, a power of two
+TRANSPOSITION_TABLE_SIZE = 1 << 20
+# Seed of the Zobrist hash keys, the same in every process so hashes can be compared
+ZOBRIST_SEED = 1
+# How much more likely a player makes a move without a card than with it, see BeliefModel. A defender that takes,
+# an attacker that finishes the turn without throwing in, and a defender that beats with a higher card than needed.
+BELIEF_TAKE_LIKELIHOOD = 0.3
+BELIEF_PASS_LIKELIHOOD = 0.5
+BELIEF_DEFEND_LIKELIHOOD = 0.7
+# Number of decisions the rule based strategies remember, the least recently used ones are forgotten first
+DECISION_CACHE_SIZE = 1 << 16
+# Seconds the computer may think about a move in the game, it thinks on a worker thread while the game is drawn
+COMPUTER_THINK_TIME = 1.0
+
+# Events that drive the game logic
+DEAL_COMPLETE = 0
+CARD_PLAYED = 1
+CARDS_TAKEN = 2
+TURN_FINISHED = 3
+MOVE_UNDONE = 4
+
+# States of the game, they tell who has to do what next
+PLAYER_ATTACK = 0
+PLAYER_DEFEND = 1
+COMPUTER_ATTACK = 2
+COMPUTER_DEFEND = 3
+COMPUTER_TAKING = 4
+GAME_OVER = 5
+
+# Kinds of moves the engine knows, a move is a (kind, card) tuple
+ATTACK = 0
+DEFEND = 1
+TAKE = 2
+FINISH = 3
 
 # Win/Lose png relative path
 # get current working directory
@@ -0,0 +1,214 @@
+import numpy as np
+
+from Constants import PLAYER_AREA, COMPUTER_AREA, INIT_CARDS, MAX_TURNS
+from game_logic.engine.cards import DECK_SIZE, RANKS, SUIT_MASKS, RANK_MASKS
+from game_logic.engine.lookup_tables import BEATING_CARDS
+
+# The lookup tables of the scalar engine as arrays, so they can be indexed with a whole batch at once
+_BITS = np.uint64(1) << np.arange(DECK_SIZE, dtype=np.uint64)
+_SUIT_MASKS = np.array(SUIT_MASKS, dtype=np.uint64)
+_RANK_MASKS = np.array(RANK_MASKS, dtype=np.uint64)
+_BEATING_CARDS = np.array(BEATING_CARDS, dtype=np.uint64)
+_RANK_BITS = np.uint64((1 << RANKS) - 1)
+
+# Constants of the bit counting, see count_cards
+_M1 = np.uint64(0x5555555555555555)
+_M2 = np.uint64(0x3333333333333333)
+_M4 = np.uint64(0x0f0f0f0f0f0f0f0f)
+_H01 = np.uint64(0x0101010101010101)
+
+
+def count_cards(masks):
+    """
+    :param masks: An array of card masks
+    :return: An array with the number of cards in every mask
+    """
+    masks = masks - ((masks >> np.uint64(1)) & _M1)
+    masks = (masks & _M2) + ((masks >> np.uint64(2)) & _M2)
+    masks = (masks + (masks >> np.uint64(4))) & _M4
+    return ((masks * _H01) >> np.uint64(56)).astype(np.int64)
+
+
+def lowest_card(masks):
+    """
+    :param masks: An array of card masks
+    :return: An array with the lowest card of every mask, -1 for an empty mask
+    """
+    low_bits = masks & (~masks + np.uint64(1))
+    # The exponent of a power of two is exact in a float
+    return np.frexp(low_bits.astype(np.float64))[1].astype(np.int64) - 1
+
+
+def lowest_value_card(masks):
+    """
+    :param masks: An array of card masks
+    :return: An array with a card with the lowest value of every mask, regardless of the suit. -1 for an empty mask
+    """
+    ranks = (masks | masks >> np.uint64(RANKS) | masks >> np.uint64(2 * RANKS) | masks >> np.uint64(3 * RANKS)) & \
+        _RANK_BITS
+    rank = lowest_card(ranks)
+    cards = lowest_card(masks & _RANK_MASKS[np.maximum(rank, 0)])
+    return np.where(rank >= 0, cards, -1)
+
+
+class BatchEngine:
+    """
+    Plays many games of the easy strategy against itself in lockstep. Every game is a row in a set of arrays, and one
+    step makes the next move in all running games with a few array operations. The rules and the moves are the same as
+    in DurakEngine with a SimpleStrategy on both seats, so every game ends exactly like the same deal in the scalar
+    engine.
+    """
+
+    def __init__(self, decks, first_attacker=PLAYER_AREA):
+        """
+        :param decks: The shuffled decks, one row per game, see DurakEngine
+        :param first_attacker: The seat that attacks in the first turn of every game
+        """
+        self.talons = np.array(decks, dtype=np.int64).reshape(-1, DECK_SIZE)
+        games = len(self.talons)
+        # The talon of a game is the start of its row, the last card is drawn first and the first card is the trump
+        self.talon_sizes = np.full(games, DECK_SIZE, dtype=np.int64)
+        self.trump_masks = _SUIT_MASKS[self.talons[:, 0] // RANKS]
+        self.beating_cards = _BEATING_CARDS[self.talons[:, 0] // RANKS]
+
+        # The hands of both seats, one row per seat
+        self.hands = np.zeros((2, games), dtype=np.uint64)
+        # Only the cards, the values and the card that still has to be beaten are needed of the table
+        self.table_masks = np.zeros(games, dtype=np.uint64)
+        self.table_rank_masks = np.zeros(games, dtype=np.uint64)
+        self.bottom_cards = np.full(games, -1, dtype=np.int64)
+
+        self.attackers = np.full(games, first_attacker, dtype=np.int64)
+        self.is_taking = np.zeros(games, dtype=bool)
+        self.turns = np.zeros(games, dtype=np.int64)
+
+        # The index of every row in the batch the engine was created with, finished games are removed from the rows
+        self.game_indices = np.arange(games)
+        self.winners = np.full(games, -1, dtype=np.int64)
+        self.final_turns = np.zeros(games, dtype=np.int64)
+
+    def deal(self):
+        """ Deal the initial cards, the first half goes to the human player and the second half to the computer """
+        for index in range(INIT_CARDS * 2):
+            seat = PLAYER_AREA if index < INIT_CARDS else COMPUTER_AREA
+            self.draw_cards(seat, np.ones(len(self.talons), dtype=bool))
+
+    def draw_cards(self, seat, games):
+        """
+        Move the top card of the talon to the hand of the seat
+        :param seat: The seat that draws
+        :param games: A bool array with the games in which the seat draws
+        :return: A bool array with the games in which the seat got a card
+        """
+        draws = games & (self.talon_sizes > 0)
+        rows = np.flatnonzero(draws)
+        self.talon_sizes[rows] -= 1
+        self.hands[seat, rows] |= _BITS[self.talons[rows, self.talon_sizes[rows]]]
+        return draws
+
+    @property
+    def running_games(self):
+        return len(self.game_indices)
+
+    def step(self):
+        """ Make the next move in every running game, then remove the games that are over """
+        rows = np.arange(len(self.game_indices))
+        defenders = 1 - self.attackers
+        # The defender moves while the last card is not beaten, otherwise the attacker
+        is_defending = (self.bottom_cards >= 0) & ~self.is_taking
+        seats = np.where(is_defending, defenders, self.attackers)
+        hands = self.hands[seats, rows]
+
+        # Defence: the lowest card that beats the bottom card and is not a trump, otherwise the lowest trump
+        beating_cards = hands & self.beating_cards[rows, np.maximum(self.bottom_cards, 0)]
+        defence_cards = lowest_card(beating_cards & ~self.trump_masks)
+        defence_cards = np.where(defence_cards >= 0, defence_cards, lowest_card(beating_cards))
+
+        # Attack: the lowest card that is not a trump, throw-ins only with cards whose value is on the table
+        is_empty = self.table_masks == 0
+        lead_cards = hands & ~self.trump_masks
+        lead_cards = np.where(lead_cards == 0, hands, lead_cards)
+        throw_in_cards = hands & self.table_rank_masks & ~self.trump_masks
+        attack_cards = lowest_value_card(np.where(is_empty, lead_cards, throw_in_cards))
+
+        cards = np.where(is_defending, defence_cards, attack_cards)
+        plays = cards >= 0
+        bits = np.where(plays, _BITS[np.maximum(cards, 0)], np.uint64(0))
+        self.hands[seats, rows] = hands & ~bits
+        self.table_masks |= bits
+        self.table_rank_masks |= np.where(plays, _RANK_MASKS[np.maximum(cards, 0) % RANKS], np.uint64(0))
+        # A defence beats the bottom card, an attack or a throw-in becomes the new bottom card
+        self.bottom_cards = np.where(plays, np.where(is_defending, -1, cards), self.bottom_cards)
+
+        # A defender without a card to beat with takes, an attacker without a card to add finishes the turn
+        self.is_taking |= is_defending & ~plays
+        finishes = ~is_defending & ~plays
+        if finishes.any():
+            self.finish_turns(finishes, defenders)
+        self.remove_finished_games()
+
+    def finish_turns(self, games, defenders):
+        """
+        Finish the turn in the given games: the table is either taken by the defender or discarded, then both players
+        draw
+        :param games: A bool array with the games whose turn is finished
+        :param defenders: The seat of the defender of every game
+        """
+        rows = np.arange(len(self.game_indices))
+        took = games & self.is_taking
+        self.hands[defenders, rows] |= np.where(took, self.table_masks, np.uint64(0))
+        # The attacker attacks again after a take, otherwise the defender attacks next
+        self.attackers = np.where(games & ~self.is_taking, defenders, self.attackers)
+        self.is_taking &= ~games
+        self.table_masks = np.where(games, np.uint64(0), self.table_masks)
+        self.table_rank_masks = np.where(games, np.uint64(0), self.table_rank_masks)
+        self.bottom_cards = np.where(games, -1, self.bottom_cards)
+        self.turns += games
+
+        # The hand sizes are counted once and then kept up to date with the drawn cards
+        hand_sizes = [count_cards(self.hands[PLAYER_AREA]), count_cards(self.hands[COMPUTER_AREA])]
+        for i in range(INIT_CARDS):
+            for seat in (PLAYER_AREA, COMPUTER_AREA):
+                hand_sizes[seat] += self.draw_cards(seat, games & (hand_sizes[seat] < INIT_CARDS))
+
+    def remove_finished_games(self):
+        """ Save the result of every game that is over and remove its row """
+        is_over = (self.talon_sizes == 0) & ((self.hands[PLAYER_AREA] == 0) | (self.hands[COMPUTER_AREA] == 0))
+        is_finished = is_over | (self.turns >= MAX_TURNS)
+        if not is_finished.any():
+            return
+        # Games that hit the turn limit and draws have no winner
+        winners = np.where(self.hands[PLAYER_AREA] == 0, PLAYER_AREA, COMPUTER_AREA)
+        winners = np.where(is_over & ((self.hands[PLAYER_AREA] != 0) | (self.hands[COMPUTER_AREA] != 0)), winners, -1)
+        self.winners[self.game_indices[is_finished]] = winners[is_finished]
+        self.final_turns[self.game_indices[is_finished]] = self.turns[is_finished]
+
+        self.compact(~is_finished)
+
+    def compact(self, keep):
+        """
+        Remove rows from all arrays, so the following steps only work on the running games
+        :param keep: A bool array with the rows to keep
+        """
+        self.talons = self.talons[keep]
+        self.talon_sizes = self.talon_sizes[keep]
+        self.trump_masks = self.trump_masks[keep]
+        self.beating_cards = self.beating_cards[keep]
+        self.hands = self.hands[:, keep]
+        self.table_masks = self.table_masks[keep]
+        self.table_rank_masks = self.table_rank_masks[keep]
+        self.bottom_cards = self.bottom_cards[keep]
+        self.attackers = self.attackers[keep]
+        self.is_taking = self.is_taking[keep]
+        self.turns = self.turns[keep]
+        self.game_indices = self.game_indices[keep]
+
+    def play(self):
+        """
+        Play all games until they are over
+        :return: A tuple with the winning seat of every game (-1 for a draw or a game that hit the turn limit) and the
+        number of turns every game took
+        """
+        while self.running_games > 0:
+            self.step()
+        return self.winners, self.final_turns
@@ -0,0 +1,122 @@
+import numpy as np
+
+from Constants import BELIEF_TAKE_LIKELIHOOD, BELIEF_PASS_LIKELIHOOD, BELIEF_DEFEND_LIKELIHOOD
+from game_logic.engine.cards import DECK_SIZE, SUIT_MASKS, card_suit, count_cards
+
+# Bit n of a mask as an array, to turn a mask into a bool array with one operation
+_BITS = np.uint64(1) << np.arange(DECK_SIZE, dtype=np.uint64)
+
+
+def mask_to_array(mask):
+    """
+    :param mask: A card mask
+    :return: A bool array with an entry for every card
+    """
+    return (np.uint64(mask) & _BITS) != 0
+
+
+class BeliefModel:
+    """
+    What the moves of both players tell about their hidden cards. Every player has a row of weights, one for every
+    card, that start at 1. A move that a player would rarely make while holding a card multiplies the weight of the
+    card with the likelihood of the move:
+    - a defender that takes probably couldn't beat the bottom card,
+    - an attacker that finishes the turn probably had nothing to throw in,
+    - a defender probably beats with its lowest card that beats.
+    The chance that a player holds a card follows from the weights of the cards the other player hasn't seen.
+
+    The engine reports the moves before it makes them, see DurakEngine.beliefs. Only the moves of the real game are
+    reported: a search reads the weights at its root, for example to guess the hidden cards, and its copies of the
+    engine play on without the model.
+    """
+
+    def __init__(self):
+        self.weights = np.ones((2, DECK_SIZE))
+        # The number of hidden cards every player had at the last update, new cards from the talon dilute the evidence
+        self.hidden_counts = [0, 0]
+
+    def copy(self):
+        beliefs = BeliefModel()
+        beliefs.load(self)
+        return beliefs
+
+    def load(self, other):
+        """
+        Take over the weights of another model, for example to undo moves
+        :param other: The BeliefModel to copy from
+        """
+        self.weights[:] = other.weights
+        self.hidden_counts = list(other.hidden_counts)
+
+    def update_hidden_counts(self, engine):
+        """
+        Cards drawn from the talon since the last update weren't in the hand when the evidence was seen, so the
+        weights move back towards 1 in the share of the hidden cards that are new
+        """
+        for seat in range(len(self.hidden_counts)):
+            hidden_count = engine.hand_size(seat) - count_cards(engine.tracker.known[seat])
+            if hidden_count > self.hidden_counts[seat]:
+                self.weights[seat] = 1 + (self.weights[seat] - 1) * (self.hidden_counts[seat] / hidden_count)
+            self.hidden_counts[seat] = hidden_count
+
+    def card_played(self, engine, seat, card):
+        """ Called before a card is played """
+        self.update_hidden_counts(engine)
+        bottom_card = engine.bottom_card
+        if bottom_card is not None and seat == engine.defender and not engine.is_taking:
+            # Lower cards of the suit of the defence card that beat the bottom card would have been played instead
+            lower_cards = engine.beating_cards[bottom_card] & SUIT_MASKS[card_suit(card)] & ((1 << card) - 1)
+            self.weights[seat, mask_to_array(lower_cards)] *= BELIEF_DEFEND_LIKELIHOOD
+
+    def cards_taken(self, engine, seat):
+        """ Called before the defender starts taking """
+        self.update_hidden_counts(engine)
+        self.weights[seat, mask_to_array(engine.beating_cards[engine.bottom_card])] *= BELIEF_TAKE_LIKELIHOOD
+
+    def turn_finished(self, engine):
+        """ Called before the attacker finishes the turn """
+        self.update_hidden_counts(engine)
+        if len(engine.table) > 0:
+            # The attacker had no card with a value on the table, or didn't want to throw it in
+            self.weights[engine.attacker, mask_to_array(engine.table_rank_mask)] *= BELIEF_PASS_LIKELIHOOD
+
+    def opponent_probabilities(self, engine, seat):
+        """
+        :param engine: The game
+        :param seat: The seat of the player that asks, the player knows its own hand
+        :return: An array with the chance that the opponent holds each card
+        """
+        opponent = 1 - seat
+        self.update_hidden_counts(engine)
+        probabilities = mask_to_array(engine.tracker.known[opponent]).astype(float)
+        candidates = mask_to_array(engine.tracker.unseen_cards(seat, engine.hands[seat]))
+        hidden_count = self.hidden_counts[opponent]
+
+        # The hidden cards are spread over the candidates in proportion to their weights. No chance can be higher than
+        # 1, the share above that goes to the other candidates.
+        weights = np.where(candidates, self.weights[opponent], 0)
+        while hidden_count > 0 and weights.sum() > 0:
+            shares = hidden_count * weights / weights.sum()
+            is_certain = shares >= 1
+            if not is_certain.any():
+                probabilities += shares
+                break
+            probabilities[is_certain] = 1
+            hidden_count -= int(is_certain.sum())
+            weights[is_certain] = 0
+        return probabilities
+
+    def probability_matrix(self, engine, seat):
+        """
+        :return: A players by cards array with the chance that each seat holds each card, from the view of the seat
+        """
+        matrix = np.zeros((2, DECK_SIZE))
+        matrix[seat] = mask_to_array(engine.hands[seat])
+        matrix[1 - seat] = self.opponent_probabilities(engine, seat)
+        return matrix
+
+    def opponent_holds(self, engine, seat, card):
+        """
+        :return: The chance that the opponent of the seat holds the card
+        """
+        return float(self.opponent_probabilities(engine, seat)[card])
@@ -0,0 +1,61 @@
+from game_logic.engine.cards import SUITS, RANKS, card_suit, card_rank, make_card
+
+# A mask with the bits of one suit, shifted down to the lowest bits
+_SUIT_BITS = (1 << RANKS) - 1
+
+
+def canonical_view(trump_suit, masks):
+    """
+    Describe a set of card masks without the names of the suits that aren't trump. Masks that only differ by swapping
+    these three suits get the same key. The suit of a card is replaced by its slot: the trump suit is slot 0, the other
+    suits follow sorted by their cards in the masks.
+    :param trump_suit: The trump suit of the game
+    :param masks: The masks to describe, for example the hand of a player and the cards that are not played
+    :return: A tuple with the hashable key and the suit of every slot
+    """
+    # The cards of one suit in all masks, packed into one number
+    signatures = []
+    for suit in range(len(SUITS)):
+        shift = suit * RANKS
+        signature = 0
+        for mask in masks:
+            signature = signature << RANKS | (mask >> shift & _SUIT_BITS)
+        signatures.append(signature)
+
+    other_suits = sorted((suit for suit in range(len(SUITS)) if suit != trump_suit),
+                         key=lambda suit: signatures[suit], reverse=True)
+    suit_order = (trump_suit, *other_suits)
+    return tuple(signatures[suit] for suit in suit_order), suit_order
+
+
+def suit_slots(trump_suit, masks):
+    """
+    Strategies whose moves are remembered break ties between suits by these slots. Masks with the same key then give
+    the move in the same slot, whichever suits the slots hold.
+    :param trump_suit: The trump suit of the game
+    :param masks: The masks the move depends on, the same as for canonical_view
+    :return: A list with the slot of every suit, indexed by suit
+    """
+    _, suit_order = canonical_view(trump_suit, masks)
+    slots = [0] * len(SUITS)
+    for slot, suit in enumerate(suit_order):
+        slots[suit] = slot
+    return slots
+
+
+def canonical_card(card, suit_order):
+    """
+    :param card: The card in the game
+    :param suit_order: The suit of every slot, from canonical_view
+    :return: The card with its suit replaced by its slot
+    """
+    return make_card(suit_order.index(card_suit(card)), card_rank(card))
+
+
+def actual_card(card, suit_order):
+    """
+    :param card: The card with its slot in place of the suit
+    :param suit_order: The suit of every slot, from canonical_view
+    :return: The card in the game
+    """
+    return make_card(suit_order[card_suit(card)], card_rank(card))
@@ -0,0 +1,79 @@
+from Constants import PLAYER_AREA, COMPUTER_AREA
+from game_logic.engine.cards import SUITS, SUIT_MASKS, FULL_DECK_MASK, card_suit, count_cards, iter_cards
+
+
+class CardTracker:
+    """
+    Counts the cards from what both players can see. The engine reports every event to it, so the strategies can
+    ask which cards are still in play without rescanning the played cards.
+    """
+
+    def __init__(self, trump_card, talon_size):
+        """
+        :param trump_card: The face up trump card at the bottom of the talon
+        :param talon_size: The number of cards in the talon before the deal
+        """
+        self.trump_card = trump_card
+        self.talon_size = talon_size
+
+        # Cards that are not discarded yet, as a mask and counted per suit
+        self.unplayed = FULL_DECK_MASK
+        self.unplayed_counts = [count_cards(mask) for mask in SUIT_MASKS]
+        # The cards on the table
+        self.on_table = 0
+        # The cards each player is known to hold: cards taken from the table and the drawn trump card, indexed by seat
+        self.known = [0, 0]
+
+    def card_drawn(self, seat, card):
+        self.talon_size -= 1
+        # Everybody saw who got the face up trump card
+        if card == self.trump_card:
+            self.known[seat] |= 1 << card
+
+    def card_played(self, seat, card):
+        self.known[seat] &= ~(1 << card)
+        self.on_table |= 1 << card
+
+    def cards_taken(self, seat):
+        self.known[seat] |= self.on_table
+        self.on_table = 0
+
+    def cards_discarded(self):
+        self.unplayed &= ~self.on_table
+        for card in iter_cards(self.on_table):
+            self.unplayed_counts[card_suit(card)] -= 1
+        self.on_table = 0
+
+    def unplayed_cards(self, suit):
+        """
+        :param suit: The index of the suit
+        :return: A mask with the cards of the suit that are not discarded yet
+        """
+        return self.unplayed & SUIT_MASKS[suit]
+
+    def unseen_cards(self, seat, hand):
+        """
+        The cards a player can't locate: they are either in the opponent's hand or in the talon
+        :param seat: The seat of the player
+        :param hand: The hand of the player
+        :return: A mask with the unseen cards
+        """
+        opponent = COMPUTER_AREA if seat == PLAYER_AREA else PLAYER_AREA
+        unseen = self.unplayed & ~self.on_table & ~hand & ~self.known[opponent]
+        if self.talon_size > 0:
+            unseen &= ~(1 << self.trump_card)
+        return unseen
+
+    def unseen_counts(self, seat, hand):
+        """
+        :return: The number of unseen cards of every suit, indexed by suit
+        """
+        unseen = self.unseen_cards(seat, hand)
+        return [count_cards(unseen & SUIT_MASKS[suit]) for suit in range(len(SUITS))]
+
+    def copy(self):
+        tracker = CardTracker.__new__(CardTracker)
+        tracker.__dict__.update(self.__dict__)
+        tracker.unplayed_counts = list(self.unplayed_counts)
+        tracker.known = list(self.known)
+        return tracker
@@ -0,0 +1,127 @@
+# A card is encoded as a single integer: suit * RANKS + rank, where the rank 0 is the six and the rank 8 is the ace.
+# A set of cards (a hand, the table, the discard pile) is a bitmask in which bit n is set if card n is in the set.
+
+SUITS = ("Clubs", "Diamonds", "Hearts", "Spades")
+VALUES = (6, 7, 8, 9, 10, 11, 12, 13, 14)
+RANKS = len(VALUES)
+DECK_SIZE = len(SUITS) * RANKS
+
+FULL_DECK_MASK = (1 << DECK_SIZE) - 1
+
+# All cards of one suit, indexed by suit
+SUIT_MASKS = tuple(((1 << RANKS) - 1) << (suit * RANKS) for suit in range(len(SUITS)))
+
+# All cards of one rank, indexed by rank
+RANK_MASKS = tuple(sum(1 << (suit * RANKS + rank) for suit in range(len(SUITS))) for rank in range(RANKS))
+
+
+def make_card(suit, rank):
+    return suit * RANKS + rank
+
+
+def card_from_name(suit_name, value):
+    """
+    :param suit_name: The name of the suit, for example "Clubs"
+    :param value: The value of the card from 6 to 14
+    :return: The encoded card
+    """
+    return make_card(SUITS.index(suit_name), value - VALUES[0])
+
+
+def card_suit(card):
+    return card // RANKS
+
+
+def card_rank(card):
+    return card % RANKS
+
+
+def card_value(card):
+    return VALUES[card % RANKS]
+
+
+def value_rank(value):
+    return value - VALUES[0]
+
+
+def card_name(card):
+    return f"{card_value(card)} of {SUITS[card_suit(card)]}"
+
+
+def new_deck():
+    """
+    Create an unshuffled deck with all 36 cards
+    :return: A list with every card of the deck
+    """
+    return list(range(DECK_SIZE))
+
+
+def cards_to_mask(cards):
+    mask = 0
+    for card in cards:
+        mask |= 1 << card
+    return mask
+
+
+def iter_cards(mask):
+    """
+    Iterate over the cards of a mask, from the lowest to the highest code
+    """
+    while mask:
+        low_bit = mask & -mask
+        yield low_bit.bit_length() - 1
+        mask ^= low_bit
+
+
+def count_cards(mask):
+    return bin(mask).count("1")
+
+
+def lowest_card(mask):
+    """
+    :return: The card with the lowest code in the mask, for cards of one suit this is the lowest value. None if
+    the mask is empty
+    """
+    if mask == 0:
+        return None
+    return (mask & -mask).bit_length() - 1
+
+
+def highest_card(mask):
+    if mask == 0:
+        return None
+    return mask.bit_length() - 1
+
+
+def ranks_of(mask):
+    """
+    Fold the four suits of a mask on top of each other
+    :return: A mask with RANKS bits, bit n is set if any card with rank n is in the mask
+    """
+    return (mask | mask >> RANKS | mask >> (2 * RANKS) | mask >> (3 * RANKS)) & ((1 << RANKS) - 1)
+
+
+def same_rank_mask(mask):
+    """
+    :return: A mask with every card that has the same rank as any card in the given mask
+    """
+    ranks = ranks_of(mask)
+    return ranks | ranks << RANKS | ranks << (2 * RANKS) | ranks << (3 * RANKS)
+
+
+def above_mask(card):
+    """
+    :return: A mask with all cards of the same suit as the card that have a higher rank
+    """
+    return SUIT_MASKS[card_suit(card)] & ~((2 << card) - 1)
+
+
+def lowest_value_card(mask):
+    """
+    :return: A card with the lowest value in the mask, regardless of the suit. None if the mask is empty
+    """
+    ranks = ranks_of(mask)
+    if ranks == 0:
+        return None
+    rank = (ranks & -ranks).bit_length() - 1
+    return lowest_card(mask & RANK_MASKS[rank])
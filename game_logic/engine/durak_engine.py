@@ -0,0 +1,362 @@
+from Constants import PLAYER_AREA, COMPUTER_AREA, INIT_CARDS, ATTACK, DEFEND, TAKE, FINISH
+from game_logic.engine.card_tracker import CardTracker
+from game_logic.engine.cards import SUIT_MASKS, RANK_MASKS, card_suit, value_rank, count_cards, iter_cards
+from game_logic.engine.lookup_tables import BEATING_CARDS, SAME_RANK_CARDS
+from game_logic.engine.zobrist import HAND_KEYS, ATTACK_KEYS, DEFENCE_KEYS, BOTTOM_KEYS, DISCARD_KEYS, TALON_KEYS, \
+    ATTACKER_KEY, TAKING_KEY, hash_game
+
+
+def other_seat(seat):
+    return COMPUTER_AREA if seat == PLAYER_AREA else PLAYER_AREA
+
+
+class DurakEngine:
+    """ Headless Durak rules engine, holds the complete game state as plain data """
+
+    def __init__(self, deck, first_attacker=PLAYER_AREA):
+        """
+        Create a new game from a shuffled deck
+        :param deck: The shuffled deck of encoded cards, the last card is drawn first and the first card is the trump
+        card
+        :param first_attacker: The seat that attacks in the first turn
+        """
+        # The cards that can still be drawn, the trump card lies at the bottom (index 0)
+        self.talon = list(deck)
+        self.trump_card = self.talon[0]
+        self.trump_suit = card_suit(self.trump_card)
+        # The row of the beats table for this trump suit
+        self.beating_cards = BEATING_CARDS[self.trump_suit]
+
+        # The hands of both players as bitmasks, indexed by seat
+        self.hands = [0, 0]
+        # Counts what both players have seen, for the strategies
+        self.tracker = CardTracker(self.trump_card, len(self.talon))
+
+        # Every pair on the table is [attack card, defence card], the defence card is None until it is beaten.
+        # table_mask holds the same cards as a bitmask and table_rank_mask all cards with a value on the table.
+        self.table = []
+        self.table_mask = 0
+        self.table_rank_mask = 0
+        self.discard = 0
+
+        self.attacker = first_attacker
+        self.is_taking = False
+        self.turns = 0
+
+        # The Zobrist hash of the game, every move updates it with a few xors
+        self.zobrist_hash = hash_game(self)
+        # A BeliefModel that is told about every move, None if no strategy needs it. Copies of the engine don't have
+        # one, so searches can't change the beliefs of the real game, and the moves tried in a search don't update it.
+        self.beliefs = None
+
+    @property
+    def defender(self):
+        return other_seat(self.attacker)
+
+    @property
+    def bottom_card(self):
+        """ The attack card that still has to be beaten, or None """
+        if len(self.table) > 0 and self.table[-1][1] is None:
+            return self.table[-1][0]
+        return None
+
+    @property
+    def to_move(self):
+        """ The seat that has to make the next move """
+        if self.bottom_card is not None and not self.is_taking:
+            return self.defender
+        return self.attacker
+
+    def deal(self):
+        """
+        Deal the initial cards, the first half goes to the human player and the second half to the computer
+        :return: A list of (seat, card) tuples in the order the cards were dealt
+        """
+        dealt = []
+        for index in range(INIT_CARDS * 2):
+            seat = PLAYER_AREA if index < INIT_CARDS else COMPUTER_AREA
+            dealt.append((seat, self.draw_card(seat)))
+        return dealt
+
+    def hand_size(self, seat):
+        return count_cards(self.hands[seat])
+
+    def hand_cards(self, seat):
+        """
+        :return: A list with the cards in the hand of the seat
+        """
+        return list(iter_cards(self.hands[seat]))
+
+    def has_card(self, seat, card):
+        return self.hands[seat] >> card & 1 == 1
+
+    def table_cards(self):
+        """
+        :return: A list with all cards that lie on the table, in the order they were played
+        """
+        return [card for pair in self.table for card in pair if card is not None]
+
+    def cards_with_suit(self, seat, suit):
+        """
+        :param seat: The seat whose hand is searched
+        :param suit: The index of the suit to look for
+        :return: A mask with the cards of the given suit
+        """
+        return self.hands[seat] & SUIT_MASKS[suit]
+
+    def cards_with_value(self, seat, value):
+        """
+        :param seat: The seat whose hand is searched
+        :param value: The value to look for, from 6 to 14
+        :return: A mask with the cards of the given value
+        """
+        return self.hands[seat] & RANK_MASKS[value_rank(value)]
+
+    def beats(self, top_card, bottom_card):
+        """
+        Check if a card beats another card
+        :param top_card: The card that is put on top
+        :param bottom_card: The card that has to be beaten
+        :return: True if top_card beats bottom_card
+        """
+        return self.beating_cards[bottom_card] >> top_card & 1 == 1
+
+    def is_valid_attack_card(self, card):
+        """
+        A new attack card has to match the value of a card on the table, unless the table is empty
+        """
+        return len(self.table) == 0 or self.table_rank_mask >> card & 1 == 1
+
+    def attack_cards(self, seat):
+        """
+        :param seat: The seat that wants to attack
+        :return: A mask with the cards the seat may attack or throw in with right now
+        """
+        if seat != self.attacker:
+            return 0
+        # While the defender has not beaten the last card, only a throw-in to a taking defender is allowed
+        if self.bottom_card is not None and not self.is_taking:
+            return 0
+        if len(self.table) == 0:
+            return self.hands[seat]
+        return self.hands[seat] & self.table_rank_mask
+
+    def defence_cards(self, seat):
+        """
+        :param seat: The seat that wants to defend
+        :return: A mask with the cards the seat may beat the bottom card with right now
+        """
+        bottom_card = self.bottom_card
+        if seat != self.defender or self.is_taking or bottom_card is None:
+            return 0
+        return self.hands[seat] & self.beating_cards[bottom_card]
+
+    def playable_cards(self, seat):
+        """
+        :return: A mask with all cards the seat may put on the table right now
+        """
+        return self.attack_cards(seat) | self.defence_cards(seat)
+
+    def can_attack(self, seat, card):
+        return self.attack_cards(seat) >> card & 1 == 1
+
+    def can_defend(self, seat, card):
+        return self.defence_cards(seat) >> card & 1 == 1
+
+    def can_take(self, seat):
+        return seat == self.defender and self.bottom_card is not None and not self.is_taking
+
+    def can_finish(self):
+        """ The attacker can end the turn once there are cards on the table and the last one is beaten or taken """
+        return len(self.table) > 0 and (self.bottom_card is None or self.is_taking)
+
+    def legal_moves(self):
+        """
+        All moves of the seat that has to move. A move is a (kind, card) tuple with one of the kinds of moves from the
+        Constants, the card is None for taking and finishing.
+        :return: A list with the legal moves, empty if the game is over
+        """
+        if self.is_over:
+            return []
+        seat = self.to_move
+        if self.can_take(seat):
+            moves = [(DEFEND, card) for card in iter_cards(self.defence_cards(seat))]
+            moves.append((TAKE, None))
+            return moves
+        moves = [(ATTACK, card) for card in iter_cards(self.attack_cards(seat))]
+        if self.can_finish():
+            moves.append((FINISH, None))
+        return moves
+
+    def apply_move(self, move):
+        """
+        Make a move for the seat that has to move
+        :param move: A (kind, card) tuple, see legal_moves
+        :return: True if the move was valid and applied
+        """
+        kind, card = move
+        seat = self.to_move
+        if kind == ATTACK:
+            return self.attack(seat, card)
+        elif kind == DEFEND:
+            return self.defend(seat, card)
+        elif kind == TAKE:
+            return self.take(seat)
+        elif self.can_finish():
+            self.finish_turn()
+            return True
+        return False
+
+    def attack(self, seat, card):
+        """
+        Put a new attack card on the table
+        :return: True if the move was valid and applied
+        """
+        if not self.can_attack(seat, card):
+            return False
+        if self.beliefs is not None:
+            self.beliefs.card_played(self, seat, card)
+        self.hands[seat] &= ~(1 << card)
+        self.tracker.card_played(seat, card)
+        # A throw-in to a taking defender replaces the card that was not beaten as the bottom card
+        bottom_card = self.bottom_card
+        if bottom_card is not None:
+            self.zobrist_hash ^= BOTTOM_KEYS[bottom_card]
+        self.zobrist_hash ^= HAND_KEYS[seat][card] ^ ATTACK_KEYS[card] ^ BOTTOM_KEYS[card]
+        self.table.append([card, None])
+        self.table_mask |= 1 << card
+        self.table_rank_mask |= SAME_RANK_CARDS[card]
+        return True
+
+    def defend(self, seat, card):
+        """
+        Beat the last attack card on the table
+        :return: True if the move was valid and applied
+        """
+        if not self.can_defend(seat, card):
+            return False
+        if self.beliefs is not None:
+            self.beliefs.card_played(self, seat, card)
+        self.hands[seat] &= ~(1 << card)
+        self.tracker.card_played(seat, card)
+        self.zobrist_hash ^= HAND_KEYS[seat][card] ^ DEFENCE_KEYS[card] ^ BOTTOM_KEYS[self.table[-1][0]]
+        self.table[-1][1] = card
+        self.table_mask |= 1 << card
+        self.table_rank_mask |= SAME_RANK_CARDS[card]
+        return True
+
+    def take(self, seat):
+        """
+        The defender gives up, the cards on the table are collected when the turn is finished
+        :return: True if the defender is now taking
+        """
+        if not self.can_take(seat):
+            return False
+        if self.beliefs is not None:
+            self.beliefs.cards_taken(self, seat)
+        self.is_taking = True
+        self.zobrist_hash ^= TAKING_KEY
+        return True
+
+    def finish_turn(self):
+        """
+        Finish the current turn: the table is either taken by the defender or discarded, then both players draw
+        :return: A list of (seat, card) tuples in the order the cards were drawn
+        """
+        if self.beliefs is not None:
+            self.beliefs.turn_finished(self)
+        # Take the table out of the hash, it is hashed again where the cards go
+        bottom_card = self.bottom_card
+        if bottom_card is not None:
+            self.zobrist_hash ^= BOTTOM_KEYS[bottom_card]
+        for attack_card, defence_card in self.table:
+            self.zobrist_hash ^= ATTACK_KEYS[attack_card]
+            if defence_card is not None:
+                self.zobrist_hash ^= DEFENCE_KEYS[defence_card]
+
+        if self.is_taking:
+            # The defender takes everything and the attacker attacks again
+            self.hands[self.defender] |= self.table_mask
+            self.tracker.cards_taken(self.defender)
+            for card in iter_cards(self.table_mask):
+                self.zobrist_hash ^= HAND_KEYS[self.defender][card]
+            self.is_taking = False
+            self.zobrist_hash ^= TAKING_KEY
+        else:
+            self.discard |= self.table_mask
+            self.tracker.cards_discarded()
+            for card in iter_cards(self.table_mask):
+                self.zobrist_hash ^= DISCARD_KEYS[card]
+            self.attacker = self.defender
+            self.zobrist_hash ^= ATTACKER_KEY
+        self.table = []
+        self.table_mask = 0
+        self.table_rank_mask = 0
+        self.turns += 1
+
+        drawn = []
+        for i in range(INIT_CARDS):
+            for seat in (PLAYER_AREA, COMPUTER_AREA):
+                if len(self.talon) > 0 and self.hand_size(seat) < INIT_CARDS:
+                    drawn.append((seat, self.draw_card(seat)))
+        return drawn
+
+    def draw_card(self, seat):
+        """
+        Move the top card of the talon to a hand
+        :return: The drawn card
+        """
+        card = self.talon.pop()
+        self.hands[seat] |= 1 << card
+        self.tracker.card_drawn(seat, card)
+        self.zobrist_hash ^= TALON_KEYS[len(self.talon)][card] ^ HAND_KEYS[seat][card]
+        return card
+
+    def copy(self):
+        """
+        :return: An independent copy of the game, for example to try moves in a search
+        """
+        engine = DurakEngine.__new__(DurakEngine)
+        engine.__dict__.update(self.__dict__)
+        engine.talon = list(self.talon)
+        engine.hands = list(self.hands)
+        engine.tracker = self.tracker.copy()
+        engine.table = [list(pair) for pair in self.table]
+        engine.beliefs = None
+        return engine
+
+    def restore(self, state):
+        """
+        Continue the game from a snapshot, see GameState. The beliefs are not part of the snapshot and stay as they
+        are.
+        :param state: The GameState to go back to
+        """
+        self.talon = list(state.talon)
+        self.trump_card = state.trump_card
+        self.trump_suit = card_suit(state.trump_card)
+        self.beating_cards = BEATING_CARDS[self.trump_suit]
+        self.hands = list(state.hands)
+        self.tracker = state.tracker.copy()
+        self.table = [list(pair) for pair in state.table]
+        self.table_mask = state.table_mask
+        self.table_rank_mask = state.table_rank_mask
+        self.discard = state.discard
+        self.attacker = state.attacker
+        self.is_taking = state.is_taking
+        self.zobrist_hash = state.zobrist_hash
+        self.turns = state.turns
+
+    @property
+    def is_over(self):
+        return len(self.talon) == 0 and (self.hands[PLAYER_AREA] == 0 or self.hands[COMPUTER_AREA] == 0)
+
+    @property
+    def is_draw(self):
+        return self.is_over and self.hands[PLAYER_AREA] == 0 and self.hands[COMPUTER_AREA] == 0
+
+    @property
+    def winner(self):
+        """ The seat that got rid of all cards first, None while the game is running or if it ended in a draw """
+        if not self.is_over or self.is_draw:
+            return None
+        return PLAYER_AREA if self.hands[PLAYER_AREA] == 0 else COMPUTER_AREA
@@ -0,0 +1,67 @@
+from typing import NamedTuple
+
+from Constants import PLAYER_AREA, COMPUTER_AREA
+from game_logic.engine.card_tracker import CardTracker
+from game_logic.engine.durak_engine import DurakEngine
+
+
+class GameState(NamedTuple):
+    """
+    An immutable snapshot of a game. apply returns a new state and leaves the old one untouched, so a search can
+    branch from one state as often as it likes and the game can go back to an earlier state. Parts that a move does
+    not change, like the talon during a turn, are shared between the states.
+    """
+    talon: tuple
+    trump_card: int
+    hands: tuple
+    table: tuple
+    table_mask: int
+    table_rank_mask: int
+    discard: int
+    attacker: int
+    is_taking: bool
+    turns: int
+    zobrist_hash: int
+    # The tracker is copied into and out of the state, the state's own tracker is never changed
+    tracker: CardTracker
+
+    @classmethod
+    def from_engine(cls, engine: DurakEngine, previous=None):
+        """
+        :param engine: The engine to take the snapshot of
+        :param previous: A state the engine was created from, its talon is reused if no card was drawn since
+        :return: The state of the engine
+        """
+        if previous is not None and len(previous.talon) == len(engine.talon):
+            talon = previous.talon
+        else:
+            talon = tuple(engine.talon)
+        return cls(talon, engine.trump_card, tuple(engine.hands), tuple(tuple(pair) for pair in engine.table),
+                   engine.table_mask, engine.table_rank_mask, engine.discard, engine.attacker, engine.is_taking,
+                   engine.turns, engine.zobrist_hash, engine.tracker.copy())
+
+    def to_engine(self):
+        """
+        :return: A new engine that continues the game from this state
+        """
+        engine = DurakEngine.__new__(DurakEngine)
+        engine.beliefs = None
+        engine.restore(self)
+        return engine
+
+    def apply(self, move):
+        """
+        :param move: A (kind, card) tuple, see DurakEngine.legal_moves
+        :return: The state after the move, None if the move is not legal
+        """
+        engine = self.to_engine()
+        if not engine.apply_move(move):
+            return None
+        return GameState.from_engine(engine, self)
+
+    def legal_moves(self):
+        return self.to_engine().legal_moves()
+
+    @property
+    def is_over(self):
+        return len(self.talon) == 0 and (self.hands[PLAYER_AREA] == 0 or self.hands[COMPUTER_AREA] == 0)
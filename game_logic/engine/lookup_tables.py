@@ -0,0 +1,23 @@
+from game_logic.engine.cards import SUITS, DECK_SIZE, SUIT_MASKS, RANK_MASKS, card_suit, card_rank, above_mask
+
+# The tables are built once when the module is imported, so the rules can be checked with a single lookup.
+
+
+def _beating_cards(trump_suit, bottom_card):
+    """
+    :return: A mask with all cards that beat the bottom card if trump_suit is trump
+    """
+    if card_suit(bottom_card) == trump_suit:
+        return above_mask(bottom_card)
+    return above_mask(bottom_card) | SUIT_MASKS[trump_suit]
+
+
+# BEATING_CARDS[trump_suit][bottom_card] is a mask with every card that beats bottom_card. Every row is one row of the
+# 36x36 "beats" table packed into the bits of an integer, so top_card beats bottom_card if
+# BEATING_CARDS[trump_suit][bottom_card] >> top_card & 1 is set.
+BEATING_CARDS = tuple(tuple(_beating_cards(trump_suit, bottom_card) for bottom_card in range(DECK_SIZE))
+                      for trump_suit in range(len(SUITS)))
+
+# SAME_RANK_CARDS[card] is a mask with the four cards of the same rank, these are the cards that may be added to the
+# table once the card lies on it
+SAME_RANK_CARDS = tuple(RANK_MASKS[card_rank(card)] for card in range(DECK_SIZE))
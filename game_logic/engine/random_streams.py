@@ -0,0 +1,53 @@
+import hashlib
+import random
+
+from game_logic.engine.cards import new_deck
+
+
+def derive_seed(seed, *path):
+    """
+    Derive the seed of an independent stream. The same seed and path give the same result in every process, unlike
+    the built-in hash of Python.
+    :param seed: The seed of the parent stream
+    :param path: Names or indices of the child stream, for example ("strategy", seat)
+    :return: A 64 bit seed
+    """
+    digest = hashlib.blake2b(repr((seed, *path)).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+def new_seed():
+    """
+    :return: A seed from the operating system, for games that don't have to be replayed
+    """
+    return random.SystemRandom().getrandbits(63)
+
+
+class RandomStreams:
+    """
+    The random numbers of one game. Every part of the game that needs random numbers gets its own stream, so the
+    streams don't depend on each other, or on the process or worker that plays the game. The whole game can be
+    replayed from its seed.
+    """
+
+    def __init__(self, seed=None):
+        """
+        :param seed: The seed of the game, a new seed from the operating system if None
+        """
+        self.seed = new_seed() if seed is None else seed
+
+    def deck(self):
+        """
+        :return: A new deck of encoded cards, shuffled with the seed of the game
+        """
+        # The deck is shuffled with the seed itself, so a seed always deals the same cards as in earlier versions
+        deck = new_deck()
+        random.Random(self.seed).shuffle(deck)
+        return deck
+
+    def stream(self, *path):
+        """
+        :param path: The name of the stream, for example ("strategy", seat)
+        :return: A random.Random that only this part of the game uses
+        """
+        return random.Random(derive_seed(self.seed, *path))
@@ -0,0 +1,53 @@
+import random
+
+from Constants import COMPUTER_AREA, ZOBRIST_SEED
+from game_logic.engine.cards import DECK_SIZE, SUITS, iter_cards
+
+# The keys are made with a fixed seed, so every process hashes the same game to the same number
+_rng = random.Random(ZOBRIST_SEED)
+
+
+def _keys(count):
+    return tuple(_rng.getrandbits(64) for _ in range(count))
+
+
+# One key for every card in every place it can be, the hash of a game is the xor of the keys of all places in use
+HAND_KEYS = (_keys(DECK_SIZE), _keys(DECK_SIZE))
+ATTACK_KEYS = _keys(DECK_SIZE)
+DEFENCE_KEYS = _keys(DECK_SIZE)
+BOTTOM_KEYS = _keys(DECK_SIZE)
+DISCARD_KEYS = _keys(DECK_SIZE)
+# The talon is hashed with the position of every card, so the order of the cards counts
+TALON_KEYS = tuple(_keys(DECK_SIZE) for _ in range(DECK_SIZE))
+TRUMP_KEYS = _keys(len(SUITS))
+ATTACKER_KEY = _rng.getrandbits(64)
+TAKING_KEY = _rng.getrandbits(64)
+# Keys for searches that restrict the order of the throw-ins, they add the lowest allowed throw-in to the hash
+THROW_IN_KEYS = _keys(DECK_SIZE)
+
+
+def hash_game(engine):
+    """
+    Calculate the hash of a game from scratch, the engine keeps it up to date after every move
+    :param engine: The DurakEngine to hash
+    :return: The 64 bit hash
+    """
+    zobrist_hash = TRUMP_KEYS[engine.trump_suit]
+    for seat in range(len(engine.hands)):
+        for card in iter_cards(engine.hands[seat]):
+            zobrist_hash ^= HAND_KEYS[seat][card]
+    for position, card in enumerate(engine.talon):
+        zobrist_hash ^= TALON_KEYS[position][card]
+    for attack_card, defence_card in engine.table:
+        zobrist_hash ^= ATTACK_KEYS[attack_card]
+        if defence_card is not None:
+            zobrist_hash ^= DEFENCE_KEYS[defence_card]
+    if engine.bottom_card is not None:
+        zobrist_hash ^= BOTTOM_KEYS[engine.bottom_card]
+    for card in iter_cards(engine.discard):
+        zobrist_hash ^= DISCARD_KEYS[card]
+    if engine.attacker == COMPUTER_AREA:
+        zobrist_hash ^= ATTACKER_KEY
+    if engine.is_taking:
+        zobrist_hash ^= TAKING_KEY
+    return zobrist_hash
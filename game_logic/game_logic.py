@@ -1,5 +1,13 @@
-from Constants import EASY, MEDIUM, HARD
+from collections import deque
+
+from Constants import EASY, MEDIUM, HARD, EXPERT, PLAYER_AREA, COMPUTER_AREA, COMPUTER_THINK_TIME
+from Constants import DEAL_COMPLETE, CARD_PLAYED, CARDS_TAKEN, TURN_FINISHED, MOVE_UNDONE
+from Constants import PLAYER_ATTACK, PLAYER_DEFEND, COMPUTER_ATTACK, COMPUTER_DEFEND, COMPUTER_TAKING, GAME_OVER
+from game_logic.engine.cards import iter_cards
+from game_logic.engine.durak_engine import DurakEngine
+from game_logic.engine.game_state import GameState
 from game_logic.strategies.difficult_strategy import DifficultStrategy
+from game_logic.strategies.ismcts_strategy import ISMCTSStrategy
 from game_logic.strategies.medium_strategy import MediumStrategy
 from game_logic.strategies.simple_strategy import SimpleStrategy
 from game_logic.strategies.strategycontext import StrategyContext
@@ -12,155 +20,320 @@ from Constants import WIN, LOSE
 class GameLogic:
     def __init__(self, player_area: PlayerArea, computer_area: PlayerArea,
                  playground: Playground, not_active_cards: NotActiveCards, difficulty: int):
+        # The play areas only show the cards, the rules and the game state live in the engine
         self.player_area = player_area
         self.computer_area = computer_area
         self.playground = playground
         self.not_active_cards = not_active_cards
+        self.difficulty = difficulty
+        self.engine = None
         self.strategy = None
-        if difficulty == EASY:
-            self.strategy = SimpleStrategy(computer_area, playground, not_active_cards, player_area)
-        elif difficulty == MEDIUM:
-            self.strategy = MediumStrategy(computer_area, playground, not_active_cards, player_area)
-        elif difficulty == HARD:
-            self.strategy = DifficultStrategy(computer_area, playground, not_active_cards, player_area)
-        self.strategy_context = StrategyContext(self.strategy, self.playground, self.computer_area)
+        self.strategy_context = None
+        # Maps the engine cards to their sprites
+        self.sprites = {}
+        # The sprites of the cards the human may play right now
+        self.playable_cards = []
+        # The game before each move of the human, together with the order of the cards in both hands
+        self.history = []
 
-    def player_move(self, mat_index, held_card) -> bool:
+        # The logic only runs when an event happened, the state tells who has to move next
+        self.events = deque()
+        self.state = PLAYER_ATTACK
+
+    def start_game(self, cards, rng=None):
+        """
+        Create the engine from the shuffled card sprites and deal the first cards
+        :param cards: The shuffled card sprites, the last card is drawn first
+        :param rng: The random stream of the computer's strategy, so the game can be replayed
+        """
+        self.sprites = {card.code: card for card in cards}
+        self.engine = DurakEngine([card.code for card in cards])
+        self.history = []
+
+        if self.difficulty == EASY:
+            self.strategy = SimpleStrategy(self.engine, COMPUTER_AREA)
+        elif self.difficulty == MEDIUM:
+            self.strategy = MediumStrategy(self.engine, COMPUTER_AREA)
+        elif self.difficulty == HARD:
+            self.strategy = DifficultStrategy(self.engine, COMPUTER_AREA)
+        elif self.difficulty == EXPERT:
+            self.strategy = ISMCTSStrategy(self.engine, COMPUTER_AREA, time_budget=COMPUTER_THINK_TIME)
+        if rng is not None:
+            self.strategy.use_rng(rng)
+        if self.strategy.needs_beliefs:
+            # NumPy is only needed for the beliefs
+            from game_logic.engine.belief_model import BeliefModel
+
+            # The beliefs follow every move the engine makes, including the human's
+            self.engine.beliefs = BeliefModel()
+            self.strategy.use_beliefs(self.engine.beliefs)
+        self.strategy_context = StrategyContext(self.strategy, self.engine)
+
+        self.deal_cards(self.engine.deal())
+        self.push_event(DEAL_COMPLETE)
+
+    def deal_cards(self, dealt):
+        """
+        Move the sprites of the cards the engine dealt from the not active cards to the hands
+        :param dealt: A list of (seat, card) tuples in the order the cards were drawn
+        """
+        for seat, card in dealt:
+            self.not_active_cards.remove_last_card()
+            sprite = self.sprites[card]
+            if seat == PLAYER_AREA:
+                sprite.face_up()
+                self.player_area.add_new_card(sprite)
+            else:
+                sprite.face_down()
+                self.computer_area.add_new_card(sprite)
+
+    def push_event(self, event):
+        """
+        Tell the logic that something happened, the state is updated right away and the reaction to it runs on the
+        next update
+        :param event: One of the events from the Constants
+        """
+        self.state = self.compute_state()
+        self.playable_cards = [self.sprites[card] for card in
+                               iter_cards(self.engine.playable_cards(PLAYER_AREA))]
+        self.events.append(event)
+
+    def has_events(self):
+        return len(self.events) > 0
+
+    def needs_update(self):
+        # Either something happened or the computer is thinking about its move
+        return self.has_events() or self.strategy_context.is_thinking
+
+    def compute_state(self):
+        """
+        :return: The state of the game that follows from the engine
+        """
+        if self.engine.is_over:
+            return GAME_OVER
+        if self.engine.to_move == PLAYER_AREA:
+            if self.engine.is_taking:
+                return COMPUTER_TAKING
+            elif self.engine.bottom_card is not None:
+                return PLAYER_DEFEND
+            return PLAYER_ATTACK
+        elif self.engine.bottom_card is not None and not self.engine.is_taking:
+            return COMPUTER_DEFEND
+        return COMPUTER_ATTACK
 
+    def undo_point(self):
+        """
+        :return: The current game, the order of the cards in both hands and the beliefs, to go back to it later
+        """
+        beliefs = self.engine.beliefs.copy() if self.engine.beliefs is not None else None
+        return (GameState.from_engine(self.engine), [card.code for card in self.player_area.get_cards()],
+                [card.code for card in self.computer_area.get_cards()], beliefs)
+
+    def can_undo(self):
+        # Only the human's moves are taken back, so the human has to be the one to move
+        return len(self.history) > 0 and not self.strategy_context.is_thinking and \
+            self.state in (PLAYER_ATTACK, PLAYER_DEFEND, COMPUTER_TAKING)
+
+    def undo(self) -> bool:
+        """
+        Go back to the game before the last move of the human, the moves the computer made since are taken back too
+        :return: True if a move was taken back
+        """
+        if not self.can_undo():
+            return False
+        state, player_cards, computer_cards, beliefs = self.history.pop()
+        self.engine.restore(state)
+        if beliefs is not None:
+            self.engine.beliefs.load(beliefs)
+        self.events.clear()
+        self.show_engine_state(player_cards, computer_cards)
+        self.push_event(MOVE_UNDONE)
+        return True
+
+    def show_engine_state(self, player_cards, computer_cards):
+        """
+        Move every sprite to the area the engine says its card is in
+        :param player_cards: The cards in the human's hand, in the order they are shown
+        :param computer_cards: The cards in the computer's hand, in the order they are shown
+        """
+        for sprite in self.sprites.values():
+            sprite.stop_moving()
+
+        # The discarded cards only ever grow, so the cards that are still discarded stay where they are
+        for sprite in list(self.not_active_cards.get_played_cards()):
+            if self.engine.discard >> sprite.code & 1 == 0:
+                self.not_active_cards.remove_played_card(sprite)
+
+        self.player_area.clear()
+        for card in player_cards:
+            self.sprites[card].face_up()
+            self.sprites[card].angle = 0
+            self.player_area.add_new_card(self.sprites[card])
+
+        self.computer_area.clear()
+        for card in computer_cards:
+            self.sprites[card].face_down()
+            self.sprites[card].angle = 0
+            self.computer_area.add_new_card(self.sprites[card])
+
+        # Every pair on the table lies on its own mat
+        self.playground.get_and_remove_all_cards()
+        for index, pair in enumerate(self.engine.table):
+            if index > 0:
+                self.playground.add_new_sprite()
+            for card in pair:
+                if card is not None:
+                    self.sprites[card].face_up()
+                    self.sprites[card].angle = 0
+                    self.playground.add_new_card(self.sprites[card])
+
+        # The talon, its first card is the trump card
+        self.not_active_cards.clear_unused_cards()
+        for card in self.engine.talon:
+            self.not_active_cards.return_card(self.sprites[card])
+        if len(self.engine.talon) > 0:
+            self.not_active_cards.show_trump_card(self.sprites[self.engine.talon[0]])
+
+    def player_move(self, mat_index, held_card) -> bool:
         if len(self.playground.get_cards()[mat_index]) >= 2:
             # There are two played_cards in the mat, so we can't put our card there
             return True
 
         elif len(self.playground.get_cards()[mat_index]) == 1:
-            # There is one card in the mat, so we need to check if the new card can be put there
-            return not self.validate_player_defence(
-                self.playground.get_cards()[mat_index][-1], held_card)
+            # There is one card in the mat, so we need to check if the new card can be put there. Only the card on
+            # the last mat can be beaten.
+            if mat_index != len(self.playground.get_cards()) - 1 or \
+                    not self.engine.can_defend(PLAYER_AREA, held_card.code):
+                return True
+            # The game is only saved for undo once the move is known to be valid
+            self.history.append(self.undo_point())
+            self.engine.defend(PLAYER_AREA, held_card.code)
 
-        elif len(self.playground.get_cards()[mat_index]) == 0:
-            # There are no unused_cards in the mat, so we need to check if the new card can be put there
-            return not self.validate_player_attack(held_card)
-
-    def validate_player_defence(self, bottom_card, top_card):
-        return self.strategy_context.validate_defence_move(bottom_card, top_card)
-
-    def validate_player_attack(self, held_card):
-        return self.strategy_context.validate_attack_move(held_card)
+        else:
+            # There are no cards in the mat, so we need to check if the new card can be put there
+            if not self.engine.can_attack(PLAYER_AREA, held_card.code):
+                return True
+            self.history.append(self.undo_point())
+            self.engine.attack(PLAYER_AREA, held_card.code)
 
-    def make_computer_defence_move(self):
-        self.player_area.is_turn = True
-        return self.strategy_context.make_computer_move(False)
+        self.push_event(CARD_PLAYED)
+        return False
 
-    def make_computer_attack_move(self):
-        self.player_area.is_turn = True
-        return self.strategy_context.make_computer_move(True)
+    def finish_computer_move(self):
+        return self.play_computer_card(self.strategy_context.finish_computer_move())
 
-    def computer_take_cards(self):
-        # Take the unused_cards from the main area
-        cards = self.strategy_context.take_cards_from_main_area()
-        # Add the unused_cards to the computer_area area
-        for card in cards:
-            card.face_down()
-            self.computer_area.add_new_card(card)
+    def play_computer_card(self, card) -> bool:
+        """
+        Move the sprite of a card the computer played in the engine to the playground
+        :param card: The played card or None
+        :return: True if a card was played
+        """
+        if card is None:
+            return False
+        sprite = self.sprites[card]
+        sprite.face_up()
+        # Add the card to the main area
+        self.playground.add_new_card(sprite)
+        # Remove the card from the computer_area area
+        self.computer_area.remove_card(sprite)
+        self.push_event(CARD_PLAYED)
+        return True
 
     def finish_player_or_bot_turn(self):
-
-        if self.computer_area.is_taking:
-            self.computer_take_cards()
-            self.computer_area.is_taking = False
-            self.player_area.is_turn = True
-        elif self.player_area.is_turn:
-            self.player_area.is_turn = False
-
-        self.finish_turn()
+        # The human can finish the turn when all cards are beaten or when the computer takes the cards
+        if (self.state == PLAYER_ATTACK or self.state == COMPUTER_TAKING) and self.engine.can_finish():
+            self.history.append(self.undo_point())
+            self.finish_turn()
 
     def finish_turn(self):
-        # First we take unused unused_cards from the not active unused_cards and add them to the computer_area and
-        # player_area area
-
-        for i in range(6):
-            if len(self.not_active_cards.unused_cards) > 0:
-                if len(self.player_area.cards) < 6:
-                    card = self.not_active_cards.remove_last_card()
-                    if card is not None:
-                        card.face_up()
-                        self.player_area.add_new_card(card)
-                if len(self.computer_area.cards) < 6:
-                    card = self.not_active_cards.remove_last_card()
-                    if card is not None:
-                        card.face_down()
-                        self.computer_area.add_new_card(card)
-
-        # We must also remove all cards from the main area
+        # The engine decides who takes the table and who draws, the areas just follow
+        defender = self.engine.defender
+        is_taking = self.engine.is_taking
+        drawn = self.engine.finish_turn()
+
+        # First the cards on the table are either taken by the defender or added to the used cards
         lst = self.playground.get_and_remove_all_cards()
-        # Now add them to the used cards
         for card in lst:
-            self.not_active_cards.add_played_card(card)
+            if not is_taking:
+                self.not_active_cards.add_played_card(card)
+            elif defender == PLAYER_AREA:
+                self.player_area.add_new_card(card)
+            else:
+                card.face_down()
+                self.computer_area.add_new_card(card)
+
+        # Then we take the drawn cards from the not active cards and add them to the computer_area and player_area
+        self.deal_cards(drawn)
+        self.push_event(TURN_FINISHED)
 
     def take_all_cards_human(self):
-        # Take the unused_cards from the main area
-        cards = self.strategy_context.take_cards_from_main_area()
-        # Add the unused_cards to the computer_area area
-        for card in cards:
-            self.player_area.add_new_card(card)
+        # The human gives up, the computer may throw in more cards before it finishes the turn and the human takes
+        # everything on the table
+        if self.state == PLAYER_DEFEND and self.engine.can_take(PLAYER_AREA):
+            self.history.append(self.undo_point())
+            self.engine.take(PLAYER_AREA)
+            self.push_event(CARDS_TAKEN)
 
     def game_over(self, view_manager, config):
-        # Check if the game is over
-        if len(self.not_active_cards.get_unused_cards()) == 0 and len(self.player_area.get_cards()) == 0:
-            view_manager.show_win_lose_view(WIN, config)
-        elif len(self.not_active_cards.get_unused_cards()) == 0 and len(self.computer_area.get_cards()) == 0:
+        # Check if the game is over, the human wins if both players got rid of their cards at the same time
+        if self.state != GAME_OVER:
+            return
+        if self.engine.winner == COMPUTER_AREA:
             view_manager.show_win_lose_view(LOSE, config)
+        else:
+            view_manager.show_win_lose_view(WIN, config)
 
     def on_update_logic(self, show_btn, hint_text, computer_text):
+        """
+        React to the next event or to the computer's finished move. Without either nothing changed, so nothing has to
+        be done.
+        :return: The new show_btn, hint_text and computer_text
+        """
+        if self.strategy_context.is_thinking:
+            # Wait for the worker until it is done or its time is up, then its best move so far is played
+            if not self.strategy_context.is_move_ready and self.strategy_context.thinking_time < COMPUTER_THINK_TIME:
+                return show_btn, hint_text, computer_text
 
-        # Check if the computer_area is taking cards
-        if self.computer_area.is_taking:
-            hint_text = "Add more cards or finish turn"
-            if len(self.playground.get_cards()[-1]) == 1:
-                self.playground.add_new_sprite()
+            if self.strategy_context.is_attack:
+                computer_text = "Computer attack"
+                if not self.finish_computer_move():
+                    self.finish_turn()
+                    computer_text = "Computer finished his turn"
+                    show_btn = False
+            else:
+                computer_text = "Computer defended"
+                if not self.finish_computer_move():
+                    self.engine.take(COMPUTER_AREA)
+                    self.push_event(CARDS_TAKEN)
+                    computer_text = "Computer is taking the cards"
+                    # Without cards in the hand there is nothing more to wait for
+                    if self.engine.hands[COMPUTER_AREA] == 0:
+                        self.finish_turn()
+            return show_btn, hint_text, computer_text
+
+        if not self.has_events():
+            return show_btn, hint_text, computer_text
+        self.events.popleft()
 
-        # Check if the human player_area is taking cards
-        elif self.player_area.is_taking:
+        # A full pair or a taking defender needs a new mat for the next card
+        if len(self.playground.get_cards()[-1]) == 2 or \
+                (self.engine.is_taking and len(self.playground.get_cards()[-1]) == 1):
             self.playground.add_new_sprite()
-            if not self.make_computer_attack_move():
-                self.player_area.is_turn = False
-                self.player_area.is_taking = False
-                self.finish_turn()
 
-        # If no one is taking cards
-        else:
-            # Check if there are no cards on the playground
-            if len(self.playground.get_cards()[-1]) == 0:
-                # If it's the computer_area's turn, try to attack
-                if not self.player_area.is_turn:
-                    computer_text = "Computer attack"
-                    if not self.make_computer_attack_move() or len(self.computer_area.get_cards()) == 0:
-                        self.finish_turn()
-                        self.player_area.is_turn = True
-                        computer_text = "Computer finished his turn"
-                        show_btn = False
-                # If it's the human player_area's turn, show a message
-                else:
-                    hint_text = "Your turn!\nAttack"
-
-            # Check if there is one card on the playground
-            elif len(self.playground.get_cards()[-1]) == 1:
-                # If it's the computer_area's turn, try to defend
-                if not self.player_area.is_turn:
-                    computer_text = "Computer defended"
-                    if not self.make_computer_defence_move():
-                        self.computer_area.is_taking = True
-                        self.player_area.is_turn = True
-                        computer_text = "Computer is taking the cards"
-                        if len(self.computer_area.get_cards()) == 0:
-                            self.finish_player_or_bot_turn()
-                # If it's the human player_area's turn, show a message
-                else:
-                    hint_text = "Your turn!\nDefend or take cards"
-                    if len(self.computer_area.get_cards()) == 0:
-                        self.finish_player_or_bot_turn()
-
-            # Check if there are two cards on the playground
-            elif len(self.playground.get_cards()[-1]) == 2:
-                self.playground.add_new_sprite()
+        if self.state == COMPUTER_ATTACK and self.engine.is_taking:
+            hint_text = "You are taking the cards"
+
+        if self.state == COMPUTER_ATTACK or self.state == COMPUTER_DEFEND:
+            # The computer thinks on a worker thread, the card is played on a later update
+            self.strategy_context.start_computer_move(self.state == COMPUTER_ATTACK)
+
+        elif self.state == COMPUTER_TAKING:
+            hint_text = "Add more cards or finish turn"
+
+        elif self.state == PLAYER_ATTACK:
+            hint_text = "Your turn!\nAttack"
+
+        elif self.state == PLAYER_DEFEND:
+            hint_text = "Your turn!\nDefend or take cards"
 
         return show_btn, hint_text, computer_text
@@ -0,0 +1,243 @@
+import mmap
+import os
+import struct
+from typing import NamedTuple
+
+from Constants import TAKE, FINISH
+from game_logic.engine.durak_engine import DurakEngine
+from game_logic.engine.random_streams import RandomStreams
+
+# Every game is stored in two files next to each other. The ".games" file holds one fixed-width record per game, the
+# ".moves" file holds the moves of all games, one byte per move. Game n is found at a fixed offset in the first file,
+# and its record points to its moves in the second file, so both can be indexed without reading anything else.
+GAMES_SUFFIX = ".games"
+MOVES_SUFFIX = ".moves"
+
+# Both files start with the magic bytes and the version of the format
+HEADER = struct.Struct("<6sH")
+GAMES_MAGIC = b"DURAKG"
+MOVES_MAGIC = b"DURAKM"
+VERSION = 1
+
+# Seed of the deal, index of the first move in the moves file, number of moves, trump card, winning seat (-1 for a
+# draw) and a code for the strategy on every seat
+GAME_RECORD = struct.Struct("<QQIBbBB")
+
+# A move byte holds the kind of the move in the two highest bits and the card in the six lowest bits
+_KIND_SHIFT = 6
+_CARD_BITS = (1 << _KIND_SHIFT) - 1
+
+
+def encode_move(kind, card):
+    """
+    :param kind: The kind of the move, see Constants
+    :param card: The card of the move, None for taking and finishing
+    :return: The move as one byte
+    """
+    return kind << _KIND_SHIFT | (0 if card is None else card)
+
+
+def decode_move(byte):
+    """
+    :param byte: A move byte, see encode_move
+    :return: The (kind, card) move, like in DurakEngine.legal_moves
+    """
+    kind = byte >> _KIND_SHIFT
+    if kind == TAKE or kind == FINISH:
+        return kind, None
+    return kind, byte & _CARD_BITS
+
+
+class GameRecord(NamedTuple):
+    seed: int
+    trump_card: int
+    winner: int
+    players: tuple
+    # The move bytes, a GameRecordReader copies them out of the mapped file so the record outlives the reader
+    moves: bytes
+
+    def decoded_moves(self):
+        """
+        :return: A list with the (kind, card) tuple of every move
+        """
+        return [decode_move(byte) for byte in self.moves]
+
+    def replay(self):
+        """
+        Deal the game again from its seed and play the recorded moves
+        :return: A generator of (engine, move) tuples, the engine shows the game before the move is made. The same
+        engine is changed by every move, copy it to keep a position.
+        """
+        engine = DurakEngine(RandomStreams(self.seed).deck())
+        engine.deal()
+        for byte in self.moves:
+            move = decode_move(byte)
+            yield engine, move
+            if not engine.apply_move(move):
+                raise ValueError(f"The recorded move {move} is not legal in game {self.seed}")
+
+
+def _open_file(path, magic):
+    """
+    Open a record file for appending, a new file gets the header first
+    :return: The file opened in binary append mode
+    """
+    file = open(path, "ab")
+    if file.tell() == 0:
+        file.write(HEADER.pack(magic, VERSION))
+    return file
+
+
+class GameRecordWriter:
+    """
+    Appends games to a pair of record files. The writes are buffered, so logging a game costs about as much as
+    building its move bytes.
+    """
+
+    def __init__(self, path):
+        """
+        :param path: The path of the record without the suffixes, existing files are continued
+        """
+        self.games_file = _open_file(path + GAMES_SUFFIX, GAMES_MAGIC)
+        self.moves_file = _open_file(path + MOVES_SUFFIX, MOVES_MAGIC)
+        # The index the first move of the next game gets
+        self.move_count = self.moves_file.tell() - HEADER.size
+
+    def append(self, seed, trump_card, winner, moves, players=(0, 0)):
+        """
+        :param seed: The seed the game was dealt with
+        :param trump_card: The trump card of the game
+        :param winner: The winning seat, None for a draw
+        :param moves: The move bytes, see encode_move
+        :param players: A code for the strategy on every seat
+        """
+        self.games_file.write(GAME_RECORD.pack(seed, self.move_count, len(moves), trump_card,
+                                               -1 if winner is None else winner, *players))
+        self.moves_file.write(moves)
+        self.move_count += len(moves)
+
+    def close(self):
+        self.games_file.close()
+        self.moves_file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _map_file(path, magic):
+    """
+    :return: The file mapped into memory for reading, None if it only holds the header
+    """
+    with open(path, "rb") as file:
+        header = file.read(HEADER.size)
+        if len(header) < HEADER.size or HEADER.unpack(header) != (magic, VERSION):
+            raise ValueError(f"{path} is not a game record of version {VERSION}")
+        if os.fstat(file.fileno()).st_size == HEADER.size:
+            return None
+        return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+class GameRecordReader:
+    """
+    Reads a pair of record files through memory maps. The games and the moves are only turned into Python objects
+    when they are accessed, so the files can be much larger than the memory.
+    """
+
+    def __init__(self, path):
+        """
+        :param path: The path of the record without the suffixes
+        """
+        self.games_map = _map_file(path + GAMES_SUFFIX, GAMES_MAGIC)
+        self.moves_map = _map_file(path + MOVES_SUFFIX, MOVES_MAGIC)
+        self.games = memoryview(self.games_map)[HEADER.size:] if self.games_map is not None else memoryview(b"")
+        self.moves = memoryview(self.moves_map)[HEADER.size:] if self.moves_map is not None else memoryview(b"")
+        # A writer may have stopped in the middle of a record, the incomplete record is ignored
+        self.game_count = len(self.games) // GAME_RECORD.size
+
+    def __len__(self):
+        return self.game_count
+
+    @property
+    def move_count(self):
+        return len(self.moves)
+
+    def record_fields(self, index):
+        """
+        :return: The raw fields of the record of game index, see GAME_RECORD
+        """
+        if not 0 <= index < self.game_count:
+            raise IndexError("game index out of range")
+        return GAME_RECORD.unpack_from(self.games, index * GAME_RECORD.size)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self.game_count
+        seed, first_move, move_count, trump_card, winner, *players = self.record_fields(index)
+        return GameRecord(seed, trump_card, winner, tuple(players),
+                          bytes(self.moves[first_move:first_move + move_count]))
+
+    def __iter__(self):
+        for index in range(self.game_count):
+            yield self[index]
+
+    def game_of_move(self, move_index):
+        """
+        Find the game a move belongs to with a binary search over the records
+        :param move_index: The index of the move in the moves file
+        :return: A tuple with the index of the game and the index of the move within the game
+        """
+        if not 0 <= move_index < self.move_count:
+            raise IndexError("move index out of range")
+        low, high = 0, self.game_count - 1
+        while low < high:
+            middle = (low + high + 1) // 2
+            if self.record_fields(middle)[1] <= move_index:
+                low = middle
+            else:
+                high = middle - 1
+        return low, move_index - self.record_fields(low)[1]
+
+    def arrays(self):
+        """
+        View both files as NumPy arrays without copying them, to scan all games or moves at once. The arrays stay
+        valid after the reader is closed, the maps behind them are closed once the arrays are collected.
+        :return: A tuple with a structured array of the game records and an uint8 array of the moves
+        """
+        # NumPy is only needed for the array views
+        import numpy as np
+
+        record_type = np.dtype([("seed", "<u8"), ("first_move", "<u8"), ("move_count", "<u4"), ("trump_card", "u1"),
+                                ("winner", "i1"), ("player0", "u1"), ("player1", "u1")])
+        games = np.frombuffer(self.games, dtype=record_type, count=self.game_count)
+        moves = np.frombuffer(self.moves, dtype=np.uint8)
+        return games, moves
+
+    def close(self):
+        """ Close the maps, the reader can't be used anymore """
+        views = (self.games, self.moves)
+        file_maps = (self.games_map, self.moves_map)
+        self.games = self.moves = memoryview(b"")
+        self.games_map = self.moves_map = None
+        self.game_count = 0
+        # The views have to be released before the maps can be closed. While arrays from arrays() still use them,
+        # both stay open and are closed when the last array is collected.
+        for view in views:
+            try:
+                view.release()
+            except BufferError:
+                pass
+        for file_map in file_maps:
+            if file_map is not None:
+                try:
+                    file_map.close()
+                except BufferError:
+                    pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,278 @@
+import time
+from multiprocessing import Pool
+
+from Constants import PLAYER_AREA, COMPUTER_AREA, MAX_TURNS, ATTACK, DEFEND, TAKE, FINISH
+from game_logic.engine.durak_engine import DurakEngine
+from game_logic.engine.random_streams import RandomStreams
+from game_logic.game_record import GameRecord, GameRecordWriter, encode_move
+from game_logic.strategies.decision_cache import shared_decision_cache
+from game_logic.strategies.difficult_strategy import DifficultStrategy
+from game_logic.strategies.ismcts_strategy import ISMCTSStrategy
+from game_logic.strategies.medium_strategy import MediumStrategy
+from game_logic.strategies.simple_strategy import SimpleStrategy
+from game_logic.strategies.strategycontext import StrategyContext
+from game_logic.strategies.transposition_table import shared_transposition_table
+
+# The strategies that can play against each other, by the name of their difficulty
+STRATEGIES = {"easy": SimpleStrategy, "medium": MediumStrategy, "hard": DifficultStrategy,
+              "expert": ISMCTSStrategy}
+# The codes of the strategies in game records
+STRATEGY_CODES = {name: code for code, name in enumerate(STRATEGIES)}
+
+
+class MatchStats:
+    """ Results of a number of games from the point of view of the first strategy """
+
+    def __init__(self):
+        self.games = 0
+        self.wins = 0
+        self.losses = 0
+        self.draws = 0
+        self.turns = 0
+        # Counters of the transposition tables of the workers
+        self.table_probes = 0
+        self.table_hits = 0
+        self.table_occupancy = 0
+        # Counters of the decision caches of the workers
+        self.cache_lookups = 0
+        self.cache_hits = 0
+        # The seconds, the seed and the seat of the first strategy of the slowest game, to replay it
+        self.slowest_game = (0, None, None)
+        # The GameRecord of every game of a worker batch, if the games are recorded
+        self.records = []
+
+    def add_game(self, winner, seat, turns, seed=None, seconds=0):
+        """
+        Count a finished game
+        :param winner: The seat that won, None for a draw
+        :param seat: The seat the first strategy played on
+        :param turns: The number of turns the game took
+        :param seed: The seed of the game
+        :param seconds: The time the game took
+        """
+        self.games += 1
+        self.turns += turns
+        if seconds > self.slowest_game[0]:
+            self.slowest_game = (seconds, seed, seat)
+        if winner is None:
+            self.draws += 1
+        elif winner == seat:
+            self.wins += 1
+        else:
+            self.losses += 1
+
+    def merge(self, other):
+        self.games += other.games
+        self.wins += other.wins
+        self.losses += other.losses
+        self.draws += other.draws
+        self.turns += other.turns
+        self.table_probes += other.table_probes
+        self.table_hits += other.table_hits
+        self.table_occupancy = max(self.table_occupancy, other.table_occupancy)
+        self.cache_lookups += other.cache_lookups
+        self.cache_hits += other.cache_hits
+        self.slowest_game = max(self.slowest_game, other.slowest_game, key=lambda game: game[0])
+
+    @property
+    def average_turns(self):
+        return self.turns / self.games if self.games > 0 else 0
+
+    @property
+    def table_hit_rate(self):
+        return self.table_hits / self.table_probes if self.table_probes > 0 else 0
+
+    @property
+    def cache_hit_rate(self):
+        return self.cache_hits / self.cache_lookups if self.cache_lookups > 0 else 0
+
+
+def shuffled_deck(seed):
+    """
+    :param seed: The seed of the game
+    :return: A new deck shuffled with the seed
+    """
+    return RandomStreams(seed).deck()
+
+
+def play_game(engine, contexts, moves=None):
+    """
+    Let two strategies play a game until it is over
+    :param engine: The engine with the dealt cards
+    :param contexts: The strategy context of every seat, indexed by seat
+    :param moves: A bytearray to append every move to, see encode_move. None to not record the moves.
+    :return: The winning seat, None for a draw
+    """
+    while not engine.is_over and engine.turns < MAX_TURNS:
+        seat = engine.to_move
+        if seat == engine.defender:
+            # The defender either beats the bottom card or takes the cards
+            card = contexts[seat].make_computer_move(False)
+            if card is None:
+                engine.take(seat)
+                move = (TAKE, None)
+            else:
+                move = (DEFEND, card)
+        else:
+            card = contexts[seat].make_computer_move(True)
+            if card is None:
+                # The attacker has nothing more to add
+                engine.finish_turn()
+                move = (FINISH, None)
+            else:
+                move = (ATTACK, card)
+        if moves is not None:
+            moves.append(encode_move(*move))
+    return engine.winner
+
+
+def setup_game(first_strategy, second_strategy, seed, first_seat=PLAYER_AREA, decision_cache=None):
+    """
+    Deal a game between two strategies
+    :param first_strategy: The strategy class of the first player
+    :param second_strategy: The strategy class of the second player
+    :param seed: The seed of the game, it shuffles the deck and seeds the random numbers of both strategies
+    :param first_seat: The seat of the first player, the player on PLAYER_AREA attacks first
+    :param decision_cache: The DecisionCache of both players, None to compute every move
+    :return: A tuple with the engine and the strategy context of every seat
+    """
+    streams = RandomStreams(seed)
+    engine = DurakEngine(streams.deck())
+    engine.deal()
+    second_seat = COMPUTER_AREA if first_seat == PLAYER_AREA else PLAYER_AREA
+    strategies = [None, None]
+    strategies[first_seat] = first_strategy(engine, first_seat)
+    strategies[second_seat] = second_strategy(engine, second_seat)
+    # Every seat gets its own stream, so the guesses of one strategy don't change the guesses of the other
+    for seat, strategy in enumerate(strategies):
+        strategy.use_rng(streams.stream("strategy", seat))
+    if any(strategy.needs_beliefs for strategy in strategies):
+        # NumPy is only needed for the beliefs
+        from game_logic.engine.belief_model import BeliefModel
+
+        engine.beliefs = BeliefModel()
+        for strategy in strategies:
+            strategy.use_beliefs(engine.beliefs)
+    contexts = [StrategyContext(strategy, engine, decision_cache=decision_cache) for strategy in strategies]
+    return engine, contexts
+
+
+def play_seeded_game(first_strategy, second_strategy, seed, first_seat=PLAYER_AREA, decision_cache=None):
+    """
+    Play one game between two strategies, see setup_game
+    :return: A tuple with the winning seat (None for a draw) and the number of turns
+    """
+    engine, contexts = setup_game(first_strategy, second_strategy, seed, first_seat, decision_cache)
+    return play_game(engine, contexts), engine.turns
+
+
+def play_games(job):
+    """
+    Play a batch of games in a worker process. The strategies swap seats after every game, so both of them attack
+    first equally often.
+    :param job: A tuple with the names of both strategies, the base seed, the first game index, the number of games,
+    whether the decisions are cached, whether the games are played by the BatchEngine and whether they are recorded
+    :return: The MatchStats of the batch, with the GameRecord of every game if they are recorded
+    """
+    first_name, second_name, base_seed, start, count, use_decision_cache, batched, record = job
+    if batched:
+        return play_batch(base_seed, start, count)
+    first_strategy = STRATEGIES[first_name]
+    second_strategy = STRATEGIES[second_name]
+    first_code, second_code = STRATEGY_CODES[first_name], STRATEGY_CODES[second_name]
+    stats = MatchStats()
+    # The table is only created in workers that play a searching strategy
+    table = None
+    if first_strategy.uses_transposition_table or second_strategy.uses_transposition_table:
+        table = shared_transposition_table()
+        table.reset_counters()
+    # The cache of a worker is kept from one batch to the next
+    decision_cache = shared_decision_cache() if use_decision_cache else None
+    if decision_cache is not None:
+        decision_cache.reset_counters()
+    for index in range(start, start + count):
+        seat = PLAYER_AREA if index % 2 == 0 else COMPUTER_AREA
+        # The seed only depends on the index of the game, not on the worker that plays it
+        seed = base_seed + index
+        start_time = time.perf_counter()
+        engine, contexts = setup_game(first_strategy, second_strategy, seed, seat, decision_cache)
+        moves = bytearray() if record else None
+        winner = play_game(engine, contexts, moves)
+        stats.add_game(winner, seat, engine.turns, seed, time.perf_counter() - start_time)
+        if record:
+            players = (first_code, second_code) if seat == PLAYER_AREA else (second_code, first_code)
+            stats.records.append(GameRecord(seed, engine.trump_card, -1 if winner is None else winner, players,
+                                            bytes(moves)))
+    if table is not None:
+        stats.table_probes = table.probes
+        stats.table_hits = table.hits
+        stats.table_occupancy = table.occupancy
+    if decision_cache is not None:
+        stats.cache_lookups = decision_cache.lookups
+        stats.cache_hits = decision_cache.hits
+    return stats
+
+
+def play_batch(base_seed, start, count):
+    """
+    Play a batch of games between two easy strategies in lockstep, see BatchEngine. The games end exactly like in
+    play_games.
+    :return: The MatchStats of the batch
+    """
+    # NumPy is only needed for the batch engine
+    from game_logic.engine.batch_engine import BatchEngine
+
+    engine = BatchEngine([shuffled_deck(base_seed + index) for index in range(start, start + count)])
+    engine.deal()
+    winners, turns = engine.play()
+    stats = MatchStats()
+    for index, winner, game_turns in zip(range(start, start + count), winners.tolist(), turns.tolist()):
+        seat = PLAYER_AREA if index % 2 == 0 else COMPUTER_AREA
+        stats.add_game(None if winner < 0 else winner, seat, game_turns)
+    return stats
+
+
+def run_match(first_name, second_name, games, base_seed=0, workers=None, batch_size=1000, use_decision_cache=False,
+              batched=False, record_path=None):
+    """
+    Play a number of games between two strategies on a process pool
+    :param first_name: The name of the first strategy, see STRATEGIES
+    :param second_name: The name of the second strategy
+    :param games: The number of games to play
+    :param base_seed: The seed of the first game, game n is shuffled with base_seed + n
+    :param workers: The number of worker processes, None for one per CPU
+    :param batch_size: The number of games a worker plays before it reports back
+    :param use_decision_cache: Let every worker remember the moves of the rule based strategies
+    :param batched: Play every batch in lockstep on the BatchEngine, only for two easy strategies
+    :param record_path: Append every game to the game record at this path, see GameRecordWriter. None to not record.
+    :return: A tuple with the MatchStats and the elapsed time in seconds
+    """
+    if batched and (first_name, second_name) != ("easy", "easy"):
+        raise ValueError("Only games between two easy strategies can be batched")
+    if batched and record_path is not None:
+        raise ValueError("Batched games can't be recorded")
+    record = record_path is not None
+    jobs = [(first_name, second_name, base_seed, start, min(batch_size, games - start), use_decision_cache, batched,
+             record) for start in range(0, games, batch_size)]
+    stats = MatchStats()
+    # Only this process writes to the record, the workers send their games with their stats
+    writer = GameRecordWriter(record_path) if record else None
+    start_time = time.perf_counter()
+    if workers == 1:
+        batches = map(play_games, jobs)
+    else:
+        pool = Pool(workers)
+        batches = pool.imap_unordered(play_games, jobs)
+    try:
+        for batch_stats in batches:
+            if writer is not None:
+                for game in batch_stats.records:
+                    writer.append(game.seed, game.trump_card, game.winner, game.moves, game.players)
+                batch_stats.records = []
+            stats.merge(batch_stats)
+    finally:
+        if workers != 1:
+            pool.terminate()
+        if writer is not None:
+            writer.close()
+    return stats, time.perf_counter() - start_time
@@ -1,19 +1,96 @@
+import copy
 from abc import ABC, abstractmethod
 
-from gui.card import Card
-from play_areas.playground import Playground
-from play_areas.not_active_cards import NotActiveCards
-from play_areas.player_area import PlayerArea
+from game_logic.engine.cards import count_cards
+from game_logic.engine.durak_engine import DurakEngine
 
 
 class Strategy(ABC):
+    # Strategies that set this get a BeliefModel that follows the moves of the game, see use_beliefs
+    needs_beliefs = False
+    # Strategies that set this search with a TranspositionTable, see use_transposition_table
+    uses_transposition_table = False
 
-    def __init__(self, computer_area: PlayerArea, playground: Playground,
-                 not_active_cards: NotActiveCards, player_area: PlayerArea):
+    def __init__(self, engine: DurakEngine, seat: int):
         super().__init__()
-        self.computer_area = computer_area
-        self.playground = playground
-        self.not_active_cards = not_active_cards
+        self.engine = engine
+        self.seat = seat
+        self.beliefs = None
+
+    @property
+    def hand(self):
+        return self.engine.hands[self.seat]
+
+    @property
+    def tracker(self):
+        """ The card tracker of the engine, it knows which cards are played and which cards the opponent holds """
+        return self.engine.tracker
+
+    def bind(self, engine: DurakEngine):
+        """
+        Create a copy of the strategy that plays on another engine, for example a snapshot a worker thread searches on
+        :param engine: The engine the copy plays on
+        :return: The copied strategy
+        """
+        strategy = copy.copy(self)
+        strategy.engine = engine
+        return strategy
+
+    def use_transposition_table(self, transposition_table):
+        """
+        Let the searches of the strategy store their results in the given table. Strategies that don't search ignore it.
+        :param transposition_table: The TranspositionTable to share
+        """
+        pass
+
+    def use_rng(self, rng):
+        """
+        Let the strategy draw its random numbers from the given stream, so its games can be replayed. Strategies that
+        don't use random numbers ignore it.
+        :param rng: The random.Random to use
+        """
+        pass
+
+    def use_beliefs(self, beliefs):
+        """
+        Let the strategy read what the moves of the opponent tell about its hand
+        :param beliefs: The BeliefModel the engine of the game reports its moves to
+        """
+        self.beliefs = beliefs
+
+    def opponent_holds(self, card):
+        """
+        :param card: A card the strategy doesn't hold
+        :return: The chance that the opponent holds the card, every unseen card is equally likely without beliefs
+        """
+        if self.beliefs is not None:
+            return self.beliefs.opponent_holds(self.engine, self.seat, card)
+        opponent = 1 - self.seat
+        if self.tracker.known[opponent] >> card & 1:
+            return 1.0
+        unseen = self.tracker.unseen_cards(self.seat, self.hand)
+        if unseen >> card & 1 == 0:
+            return 0.0
+        hidden_count = self.engine.hand_size(opponent) - count_cards(self.tracker.known[opponent])
+        return hidden_count / count_cards(unseen)
+
+    def stop(self):
+        """
+        Ask a running search to return the best move it found so far. Strategies that don't search finish right
+        away anyway.
+        """
+        pass
+
+    def decision_view(self, is_attack):
+        """
+        Describe everything the next move of the strategy depends on, so the strategy context can remember the move.
+        The move may only depend on the cards in the masks, the trump suit and the other values, and ties between suits
+        have to be broken by their slots, see suit_slots.
+        :param is_attack: True for an attack move, False for a defence move
+        :return: A tuple with a tuple of card masks and a tuple of other hashable values, None if the move can't be
+        remembered
+        """
+        return None
 
     @abstractmethod
     def compute_best_attack_move(self):
@@ -24,22 +101,7 @@ class Strategy(ABC):
         pass
 
     def validate_defence_move(self, bottom_card, top_card):
-        if bottom_card.suit == top_card.suit:
-            if top_card.value > bottom_card.value:
-                return True
-        elif top_card.suit == self.not_active_cards.trump_card.suit and bottom_card.suit != self.not_active_cards.trump_card.suit:
-            return True
-        return False
+        return bottom_card == self.engine.bottom_card and self.engine.can_defend(self.seat, top_card)
 
     def validate_attack_move(self, top_card):
-        if len(self.playground.cards[0]) == 0 and isinstance(top_card, Card):
-            return True
-        else:
-            # Get all the unused_cards from the main area
-            cards = self.playground.get_all_cards()
-            # create a set with all the values from the unused_cards
-            values = {card.value for card in cards}
-            if top_card.value in values:
-                return True
-        return False
-
+        return self.engine.can_attack(self.seat, top_card)
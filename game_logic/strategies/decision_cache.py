@@ -0,0 +1,69 @@
+from collections import OrderedDict
+
+from Constants import DECISION_CACHE_SIZE
+
+
+class DecisionCache:
+    """
+    A bounded cache of the moves the rule based strategies picked, keyed on the cards the move depends on. When it is
+    full the least recently used decision is forgotten.
+    """
+
+    def __init__(self, size=DECISION_CACHE_SIZE):
+        """
+        :param size: The maximum number of decisions to remember
+        """
+        self.size = size
+        self.decisions = OrderedDict()
+
+        # Counters to size the cache
+        self.lookups = 0
+        self.hits = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        """
+        :param key: The key of the decision
+        :param default: Returned if the decision is not known, the card of a decision can be None
+        :return: The stored decision, or the default
+        """
+        self.lookups += 1
+        decision = self.decisions.get(key, default)
+        if decision is not default:
+            self.hits += 1
+            self.decisions.move_to_end(key)
+        return decision
+
+    def put(self, key, decision):
+        self.decisions[key] = decision
+        self.decisions.move_to_end(key)
+        if len(self.decisions) > self.size:
+            self.decisions.popitem(last=False)
+            self.evictions += 1
+
+    @property
+    def hit_rate(self):
+        return self.hits / self.lookups if self.lookups > 0 else 0
+
+    def reset_counters(self):
+        self.lookups = 0
+        self.hits = 0
+        self.evictions = 0
+
+    def clear(self):
+        self.decisions.clear()
+        self.reset_counters()
+
+
+# The cache all strategy contexts share unless they are given their own
+_shared_cache = None
+
+
+def shared_decision_cache():
+    """
+    :return: The decision cache of this process, it is created on the first call
+    """
+    global _shared_cache
+    if _shared_cache is None:
+        _shared_cache = DecisionCache()
+    return _shared_cache
@@ -1,23 +1,36 @@
+from game_logic.engine.cards import SUITS, SUIT_MASKS, RANK_MASKS, card_suit, card_value, value_rank, iter_cards, \
+    lowest_card, lowest_value_card
+from game_logic.engine.canonical import suit_slots
+from game_logic.engine.durak_engine import DurakEngine
 from game_logic.strategies.computer_strategy import Strategy
-from play_areas.playground import Playground
-from play_areas.not_active_cards import NotActiveCards
-from play_areas.player_area import PlayerArea
+from game_logic.strategies.endgame_solver import EndgameSolver
 
 
 class DifficultStrategy(Strategy):
-    def __init__(self, computer_area: PlayerArea, playground: Playground,
-                 not_active_cards: NotActiveCards, player_area: PlayerArea):
-        super().__init__(computer_area, playground, not_active_cards, player_area)
-        self.not_played_cards = {"Clubs": [range(6, 15)], "Diamonds": [range(6, 15)], "Hearts": [range(6, 15)], "Spades": [range(6, 15)]}
-        self.player = player_area
+    # The endgame solver keeps its results in a transposition table
+    uses_transposition_table = True
 
-    def remove_played_cards(self):
+    def __init__(self, engine: DurakEngine, seat: int):
+        super().__init__(engine, seat)
+        # Plays the end of the game perfectly once the talon is empty
+        self.endgame_solver = EndgameSolver()
+
+    def use_transposition_table(self, transposition_table):
+        self.endgame_solver.transposition_table = transposition_table
+
+    def decision_view(self, is_attack):
+        # The solver looks at the whole game, and a defence is cheaper to compute than to look up
+        if not is_attack or self.endgame_solver.can_solve(self.engine):
+            return None
+        return self.attack_masks(), (len(self.engine.table) == 0,)
+
+    def attack_masks(self):
         """
-        Remove the played cards from the not_played_cards dict
+        :return: The masks an attack depends on, the cards that may be played and the cards that are not played yet
         """
-        for card in self.not_active_cards.played_cards:
-            if card in self.not_played_cards[card.suit]:
-                self.not_played_cards[card.suit].remove(card.value)
+        if len(self.engine.table) == 0:
+            return self.hand, self.tracker.unplayed
+        return self.engine.attack_cards(self.seat), self.tracker.unplayed
 
     def calc_bot_hand(self):
         """
@@ -26,11 +39,10 @@ class DifficultStrategy(Strategy):
         """
         # get the available card suits
         available_cards = {}
-        for card in self.computer_area.cards:
-            if card.suit != self.not_active_cards.trump_card.suit:
-                if card.suit not in available_cards:
-                    available_cards[card.suit] = []
-                available_cards[card.suit].append(card.value)
+        for card in iter_cards(self.hand & ~SUIT_MASKS[self.engine.trump_suit]):
+            if card_suit(card) not in available_cards:
+                available_cards[card_suit(card)] = []
+            available_cards[card_suit(card)].append(card_value(card))
 
         return available_cards
 
@@ -39,26 +51,26 @@ class DifficultStrategy(Strategy):
         Calculates how many cards are not played in each suit and sorts them by value
         :return: A dict with the suits and the number of cards that are not played
         """
-        # Get the lenght of each suit
+        # Get the lenght of each suit, the tracker counts the cards that are not played
         lenght_of_suit = {}
-        for suit in self.not_played_cards:
-            lenght_of_suit[suit] = len(self.not_played_cards[suit])
+        for suit in range(len(SUITS)):
+            lenght_of_suit[suit] = self.tracker.unplayed_counts[suit]
 
-        # sort the dict by value
-        lenght_of_suit = {k: v for k, v in sorted(lenght_of_suit.items(), key=lambda item: item[1])}
+        # sort the dict by value, suits with the same value by their slot
+        slots = suit_slots(self.engine.trump_suit, self.attack_masks())
+        lenght_of_suit = {k: v for k, v in sorted(lenght_of_suit.items(), key=lambda item: (item[1], slots[item[0]]))}
 
         return lenght_of_suit
 
     def find_card(self, suit, value):
         """
-        Finds the card in the computer_area by finding the intersection of the suit and value
+        Finds the card in the bot hand by intersecting the cards of the suit with the cards of the value
         :param suit: The suit of the card
         :param value: The value of the card
         :return: The card
         """
-        suit_lst = self.computer_area.get_cards_with_same_suit_str(suit)
-        value_lst = self.computer_area.get_cards_with_same_value_int(value)
-        return suit_lst.intersection(value_lst)
+        return lowest_card(self.engine.cards_with_suit(self.seat, suit) &
+                           self.engine.cards_with_value(self.seat, value))
 
     def validate_bot_hand(self, bot_hand):
         """
@@ -66,17 +78,15 @@ class DifficultStrategy(Strategy):
         :param bot_hand: The bot hand
         :return: The validated bot hand with only playable cards
         """
-        # Create a set with all the values that are in the main area
-        values = set()
-        for card in self.playground.get_all_cards():
-            values.add(card.value)
+        # A mask with all cards that may be thrown in
+        attack_cards = self.engine.attack_cards(self.seat)
 
         valid_bot_hand = {}
 
-        # Remove the values that are not in the main area
+        # Remove the cards that may not be thrown in
         for suit in bot_hand:
             for value in bot_hand[suit]:
-                if value in values:
+                if attack_cards & SUIT_MASKS[suit] & RANK_MASKS[value_rank(value)]:
                     if suit not in valid_bot_hand:
                         valid_bot_hand[suit] = []
                     valid_bot_hand[suit].append(value)
@@ -90,78 +100,57 @@ class DifficultStrategy(Strategy):
         left to play.
         :return: The card that the bot should play
         """
+        # Near the end of the game the solver knows the best move
+        move = self.endgame_solver.best_move(self.engine, self.seat)
+        if move is not None:
+            return move[1]
+
         card_to_play = None
         lenght_of_suit_not_played = self.lenght_of_suit_not_played()
-        if len(self.playground.mat_list) == 1:
+        if len(self.engine.table) == 0:
+            # The bot hand does not contain trump cards
             bot_hand = self.calc_bot_hand()
-            bot_hand_trump = None
-            if self.not_active_cards.trump_card.suit in bot_hand:
-                # Remove trump suit from the bot hand in extra dict
-                bot_hand_trump = bot_hand[self.not_active_cards.trump_card.suit]
-                # Remove trump suit from the bot hand
-                bot_hand.pop(self.not_active_cards.trump_card.suit)
 
             # The lenghth_of_suit_not_played dict is sorted by value, so the first key is the suit with the lowest value
             for suit in lenght_of_suit_not_played:
                 if suit in bot_hand:
-                    card_to_play = min(bot_hand[suit])
-                    # find the instance of the card
-                    card_to_play = self.find_card(suit, card_to_play)
-                    # Get the card out of the set
-                    card_to_play = card_to_play
+                    card_to_play = self.find_card(suit, min(bot_hand[suit]))
                     break
 
-            if card_to_play is None and bot_hand_trump is not None:
-                # Get the minimum value of bot_hand_trump
-                card_to_play = min(bot_hand_trump)
-                card_to_play = self.find_card(self.not_active_cards.trump_card.suit, card_to_play)
-
             # If the card_to_play is still None, then the bot should play the lowest card
-            elif card_to_play is None:
-                card_to_play = min(self.computer_area.cards, key=lambda card: card.value)
+            if card_to_play is None:
+                card_to_play = lowest_value_card(self.hand)
 
         else:
             hand = self.calc_bot_hand()
             valid_bot_hand = self.validate_bot_hand(hand)
-            #lenght_of_suit_bot = self.lenght_of_suit_bot(valid_bot_hand)
 
-            if self.not_active_cards.trump_card.suit in valid_bot_hand:
-                # Remove trump suit from the bot hand
-                valid_bot_hand.pop(self.not_active_cards.trump_card.suit)
             for suit in lenght_of_suit_not_played:
                 if suit in valid_bot_hand:
-                    card_to_play = min(valid_bot_hand[suit], default=None)
-                    card_to_play = self.find_card(suit, card_to_play)
+                    card_to_play = self.find_card(suit, min(valid_bot_hand[suit]))
                     break
 
-        if card_to_play is None:
-            return None
-        # Check if card_to_play is a set
-        elif isinstance(card_to_play, set):
-            if len(card_to_play) == 0:
-                return None
-            else:
-                return card_to_play.pop()
-        else:
-            return card_to_play
+        return card_to_play
 
     def compute_best_defense_move(self):
         """
         Computes the best defense move for the bot by trying to play the card with the lowest value possible
         :return: The card that the bot should play
         """
-        # Filter out the unused_cards that are not playable
-        bottom_card = self.playground.get_bottom_card()
-        # Filter the computer_area cards with the same suit as the bottom card
-        cards_with_same_suit = self.computer_area.get_cards_with_same_suit_as_card(bottom_card)
-        # Filter out the cards that have a value lower than the bottom card
-        cards_with_same_suit = {card for card in cards_with_same_suit if card.value > bottom_card.value}
-        # Get the card with the lowest value
-        card_to_play = min(cards_with_same_suit, key=lambda card: card.value, default=None)
-
-        if card_to_play is None and bottom_card.suit != self.not_active_cards.trump_card.suit and len(self.not_active_cards.unused_cards) < 20:
-            trump_cards = self.computer_area.get_cards_with_same_suit_as_card(self.not_active_cards.trump_card)
-            if len(trump_cards) > 0:
-                card_to_play = min(trump_cards, key=lambda card: card.value)
+        # Near the end of the game the solver knows the best move
+        move = self.endgame_solver.best_move(self.engine, self.seat)
+        if move is not None:
+            return move[1]
+
+        bottom_card = self.engine.bottom_card
+        # Get the cards in the hand that beat the bottom card
+        beating_cards = self.engine.defence_cards(self.seat)
+        # Take the lowest card that is not a trump, which is a higher card of the same suit
+        card_to_play = lowest_card(beating_cards & ~SUIT_MASKS[self.engine.trump_suit])
+
+        # A trump card is only used to beat a trump card or when the talon gets small
+        if card_to_play is None and \
+                (card_suit(bottom_card) == self.engine.trump_suit or self.tracker.talon_size < 20):
+            card_to_play = lowest_card(beating_cards)
 
         return card_to_play
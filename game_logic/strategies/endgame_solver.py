@@ -0,0 +1,188 @@
+import time
+
+from Constants import PLAYER_AREA, ENDGAME_CARDS, ENDGAME_TIME_BUDGET
+from game_logic.engine.cards import count_cards, iter_cards
+from game_logic.engine.durak_engine import DurakEngine, other_seat
+from game_logic.engine.zobrist import HAND_KEYS, THROW_IN_KEYS
+from game_logic.strategies.transposition_table import shared_transposition_table
+
+# Kinds of the values in the transposition table
+_EXACT = 0
+_LOWER_BOUND = 1
+_UPPER_BOUND = 2
+
+# The bound a value is from the other seat's view
+_FLIPPED_KINDS = (_EXACT, _UPPER_BOUND, _LOWER_BOUND)
+
+# The solver looks at the clock only every this many positions
+_CLOCK_INTERVAL = 1024
+
+
+class _OutOfTime(Exception):
+    pass
+
+
+class EndgameSolver:
+    """
+    Alpha-beta search for the end of the game. Once the talon is empty every card that a player hasn't seen is in the
+    opponent's hand, so the game can be searched to the end with perfect information.
+    """
+
+    def __init__(self, max_cards=ENDGAME_CARDS, time_budget=ENDGAME_TIME_BUDGET, transposition_table=None):
+        """
+        :param max_cards: The solver only starts when both hands and the table together hold at most this many cards
+        :param time_budget: The time in seconds the solver may take for one move, it gives up after that
+        :param transposition_table: The TranspositionTable for the results, the shared table of the process if None
+        """
+        self.max_cards = max_cards
+        self.time_budget = time_budget
+        # The value of a position doesn't depend on how it was reached, so the results are kept from one move to the
+        # next and can be shared with other strategies
+        self.transposition_table = transposition_table
+        self.seat = None
+        self.nodes = 0
+        self.deadline = 0
+
+    def can_solve(self, engine: DurakEngine):
+        return len(engine.talon) == 0 and not engine.is_over and \
+            count_cards(engine.hands[0] | engine.hands[1] | engine.table_mask) <= self.max_cards
+
+    def best_move(self, engine: DurakEngine, seat):
+        """
+        Search the best move of a player from what the player can see
+        :param engine: The game, only the seat's own knowledge is used
+        :param seat: The seat of the player
+        :return: The best (kind, card) move, None if the solver can't start yet or ran out of time
+        """
+        if not self.can_solve(engine) or engine.to_move != seat:
+            return None
+        moves = engine.legal_moves()
+        if len(moves) == 1:
+            return moves[0]
+
+        # With the talon empty the opponent holds exactly the cards the player hasn't seen
+        position = engine.copy()
+        opponent = other_seat(seat)
+        hand = position.tracker.known[opponent] | position.tracker.unseen_cards(seat, position.hands[seat])
+        for card in iter_cards(position.hands[opponent] ^ hand):
+            position.zobrist_hash ^= HAND_KEYS[opponent][card]
+        position.hands[opponent] = hand
+
+        if self.transposition_table is None:
+            self.transposition_table = shared_transposition_table()
+        self.transposition_table.new_search()
+        self.seat = seat
+        self.nodes = 0
+        self.deadline = time.perf_counter() + self.time_budget
+        try:
+            return self.search_root(position, moves)
+        except _OutOfTime:
+            return None
+
+    def search_root(self, engine: DurakEngine, moves):
+        """
+        Search every move of the solver's seat. The best move is returned from here and not read back from the table,
+        the entry of the position may already be replaced by a deeper one when the search ends.
+        :param moves: The legal moves of the position
+        :return: The best (kind, card) move
+        """
+        entry = self.load(engine.zobrist_hash)
+        if entry is not None and entry[2] in moves:
+            moves = [entry[2]] + [move for move in moves if move != entry[2]]
+
+        alpha = -1
+        best_value, best_move = -2, None
+        for move in moves:
+            child = engine.copy()
+            child.apply_move(move)
+            value = self.search(child, alpha, 1, move[1] if engine.is_taking and move[1] is not None else -1)
+            if value > best_value:
+                best_value, best_move = value, move
+                alpha = max(alpha, value)
+            if alpha >= 1:
+                break
+        kind = _UPPER_BOUND if best_value <= -1 else _LOWER_BOUND if best_value >= 1 else _EXACT
+        self.save(engine.zobrist_hash, best_value, kind, best_move, count_cards(engine.hands[0] | engine.hands[1]))
+        return best_move
+
+    def load(self, zobrist_hash):
+        """
+        :return: The stored value, kind of value and best move from the view of the solver's seat, or None
+        """
+        entry = self.transposition_table.probe(zobrist_hash)
+        if entry is None or self.seat == PLAYER_AREA:
+            return entry
+        # The table holds the results from the view of the human's seat, for the other seat the value flips sign and
+        # the bounds swap
+        value, kind, best_move = entry
+        return -value, _FLIPPED_KINDS[kind], best_move
+
+    def save(self, zobrist_hash, value, kind, best_move, depth):
+        if self.seat != PLAYER_AREA:
+            value, kind = -value, _FLIPPED_KINDS[kind]
+        self.transposition_table.store(zobrist_hash, (value, kind, best_move), depth)
+
+    def search(self, engine: DurakEngine, alpha, beta, lowest_throw_in):
+        """
+        :param lowest_throw_in: The cards thrown in to a taking defender only matter as a set, so they are thrown in
+        in ascending order and the next one has to be higher than this card
+        :return: The value of the position for the solver's seat: 1 for a win, 0 for a draw and -1 for a loss
+        """
+        if engine.is_over:
+            if engine.is_draw:
+                return 0
+            return 1 if engine.winner == self.seat else -1
+
+        self.nodes += 1
+        if self.nodes % _CLOCK_INTERVAL == 0 and time.perf_counter() > self.deadline:
+            raise _OutOfTime()
+
+        zobrist_hash = engine.zobrist_hash
+        if lowest_throw_in >= 0:
+            zobrist_hash ^= THROW_IN_KEYS[lowest_throw_in]
+        entry = self.load(zobrist_hash)
+        best_move = None
+        if entry is not None:
+            value, kind, best_move = entry
+            if kind == _EXACT:
+                return value
+            elif kind == _LOWER_BOUND:
+                alpha = max(alpha, value)
+            else:
+                beta = min(beta, value)
+            if alpha >= beta:
+                return value
+
+        # The best move of an earlier search is tried first, it often ends the search right away
+        moves = engine.legal_moves()
+        if engine.is_taking:
+            moves = [move for move in moves if move[1] is None or move[1] > lowest_throw_in]
+        if best_move in moves:
+            moves.remove(best_move)
+            moves.insert(0, best_move)
+
+        original_alpha, original_beta = alpha, beta
+        is_maximizing = engine.to_move == self.seat
+        best_value = -2 if is_maximizing else 2
+        for move in moves:
+            child = engine.copy()
+            child.apply_move(move)
+            value = self.search(child, alpha, beta, move[1] if engine.is_taking and move[1] is not None else -1)
+            if is_maximizing and value > best_value:
+                best_value, best_move = value, move
+                alpha = max(alpha, value)
+            elif not is_maximizing and value < best_value:
+                best_value, best_move = value, move
+                beta = min(beta, value)
+            if alpha >= beta:
+                break
+
+        if best_value <= original_alpha:
+            kind = _UPPER_BOUND
+        elif best_value >= original_beta:
+            kind = _LOWER_BOUND
+        else:
+            kind = _EXACT
+        # Positions with more cards took more work, the table keeps them longer
+        self.save(zobrist_hash, best_value, kind, best_move, count_cards(engine.hands[0] | engine.hands[1]))
+        return best_value
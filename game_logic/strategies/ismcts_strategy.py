@@ -0,0 +1,205 @@
+import math
+import random
+import time
+
+from Constants import ISMCTS_TIME_BUDGET, ISMCTS_EXPLORATION, MAX_TURNS, ATTACK, DEFEND, TAKE, FINISH
+from game_logic.engine.cards import SUIT_MASKS, cards_to_mask, count_cards, iter_cards, \
+    lowest_card, lowest_value_card
+from game_logic.engine.durak_engine import DurakEngine, other_seat
+from game_logic.engine.zobrist import hash_game
+from game_logic.strategies.computer_strategy import Strategy
+from game_logic.strategies.endgame_solver import EndgameSolver
+
+
+def _rollout_move(engine):
+    """
+    The cheap default policy of the rollouts, it plays like the simple strategy
+    """
+    seat = engine.to_move
+    trump_cards = SUIT_MASKS[engine.trump_suit]
+    if engine.can_take(seat):
+        beating_cards = engine.defence_cards(seat)
+        card = lowest_card(beating_cards & ~trump_cards)
+        if card is None:
+            card = lowest_card(beating_cards)
+        return (TAKE, None) if card is None else (DEFEND, card)
+    if len(engine.table) == 0:
+        hand = engine.hands[seat]
+        card = lowest_value_card(hand & ~trump_cards)
+        if card is None:
+            card = lowest_value_card(hand)
+        return ATTACK, card
+    card = lowest_value_card(engine.attack_cards(seat) & ~trump_cards)
+    return (FINISH, None) if card is None else (ATTACK, card)
+
+
+class _Node:
+    """ A node of the search tree, shared by all determinizations """
+    __slots__ = ("parent", "move", "seat", "children", "visits", "availability", "reward")
+
+    def __init__(self, parent=None, move=None, seat=None):
+        self.parent = parent
+        self.move = move
+        # The seat that made the move leading to this node, the reward is counted for this seat
+        self.seat = seat
+        self.children = {}
+        self.visits = 0
+        self.availability = 1
+        self.reward = 0.0
+
+    def ucb(self, exploration):
+        return self.reward / self.visits + exploration * math.sqrt(math.log(self.availability) / self.visits)
+
+
+class ISMCTSStrategy(Strategy):
+    """
+    Information set Monte Carlo tree search. Every iteration guesses the hidden cards (the opponent's hand and the
+    order of the talon) from what the bot has seen, and all guesses share one search tree.
+    """
+    # The guesses follow what the moves of the opponent tell about its hand
+    needs_beliefs = True
+    # The endgame solver keeps its results in a transposition table
+    uses_transposition_table = True
+
+    def __init__(self, engine: DurakEngine, seat: int, time_budget=ISMCTS_TIME_BUDGET,
+                 exploration=ISMCTS_EXPLORATION, rng=None):
+        """
+        :param time_budget: The time in seconds the search may take for one move
+        :param exploration: The exploration constant of the UCB formula
+        :param rng: The random.Random instance for the guesses, a new one if None
+        """
+        super().__init__(engine, seat)
+        self.time_budget = time_budget
+        self.exploration = exploration
+        self.rng = rng if rng is not None else random.Random()
+        # Set from another thread to end the search early, the search then returns the best move found so far
+        self.stop_requested = False
+        # Once the talon is empty the game is searched to the end instead of sampled
+        self.endgame_solver = EndgameSolver()
+        # The belief weights of the opponent's cards at the root of a search, None to guess every hidden card equally
+        # likely. They only decide which cards every guess deals, the moves inside the tree and the rollouts don't
+        # change them.
+        self.hidden_weights = None
+
+    def use_transposition_table(self, transposition_table):
+        self.endgame_solver.transposition_table = transposition_table
+
+    def use_rng(self, rng):
+        self.rng = rng
+
+    def bind(self, engine: DurakEngine):
+        strategy = super().bind(engine)
+        strategy.stop_requested = False
+        return strategy
+
+    def stop(self):
+        self.stop_requested = True
+
+    def determinize(self):
+        """
+        Create a copy of the game in which the cards the bot can't see are dealt randomly. Cards the opponent took from
+        the table and the drawn trump card stay where they are known to be.
+        :return: The copied engine
+        """
+        engine = self.engine.copy()
+        opponent = other_seat(self.seat)
+        known_cards = engine.tracker.known[opponent]
+
+        unknown_cards = list(iter_cards(engine.tracker.unseen_cards(self.seat, engine.hands[self.seat])))
+        hidden_count = engine.hand_size(opponent) - count_cards(known_cards)
+        if self.hidden_weights is None:
+            self.rng.shuffle(unknown_cards)
+            talon_cards = unknown_cards[hidden_count:]
+        else:
+            # Weighted sampling without replacement: every card gets the key random ** (1 / weight) and the highest
+            # keys go to the opponent. The talon is shuffled on its own, the beliefs don't say anything about it.
+            weights = self.hidden_weights
+            random_key = self.rng.random
+            unknown_cards.sort(key=lambda card: random_key() ** (1 / weights[card]), reverse=True)
+            talon_cards = unknown_cards[hidden_count:]
+            self.rng.shuffle(talon_cards)
+        engine.hands[opponent] = known_cards | cards_to_mask(unknown_cards[:hidden_count])
+        if len(engine.talon) > 0:
+            # The trump card stays at the bottom of the talon
+            engine.talon = [engine.trump_card] + talon_cards
+        engine.zobrist_hash = hash_game(engine)
+        return engine
+
+    def search(self):
+        """
+        Run the search until the time budget is used up or until it is stopped
+        :return: The move with the most visits
+        """
+        moves = self.engine.legal_moves()
+        if len(moves) == 1:
+            return moves[0]
+        move = self.endgame_solver.best_move(self.engine, self.seat)
+        if move is not None:
+            return move
+
+        # The weights are read once, so the guesses stay as cheap as a shuffle
+        self.hidden_weights = None
+        if self.beliefs is not None:
+            self.beliefs.update_hidden_counts(self.engine)
+            self.hidden_weights = self.beliefs.weights[other_seat(self.seat)].tolist()
+
+        root = _Node()
+        # Until the first search results come in the best move is the one of the rollout policy
+        best_move = _rollout_move(self.engine)
+        best_visits = 0
+        deadline = time.perf_counter() + self.time_budget
+        while not self.stop_requested and time.perf_counter() < deadline:
+            engine = self.determinize()
+            node = root
+
+            # Selection and expansion, only moves that are legal in this determinization are considered
+            while not engine.is_over:
+                legal_moves = engine.legal_moves()
+                untried_moves = [move for move in legal_moves if move not in node.children]
+                for move in legal_moves:
+                    if move in node.children:
+                        node.children[move].availability += 1
+                seat = engine.to_move
+                if len(untried_moves) > 0:
+                    move = self.rng.choice(untried_moves)
+                    engine.apply_move(move)
+                    child = _Node(node, move, seat)
+                    node.children[move] = child
+                    node = child
+                    break
+                node = max((node.children[move] for move in legal_moves), key=lambda n: n.ucb(self.exploration))
+                engine.apply_move(node.move)
+
+            # Rollout with the default policy
+            while not engine.is_over and engine.turns < MAX_TURNS:
+                engine.apply_move(_rollout_move(engine))
+            winner = engine.winner
+
+            # Backpropagation, the root child on the path is the only one whose visits changed
+            while node is not None:
+                node.visits += 1
+                if node.parent is root and node.visits > best_visits:
+                    best_move = node.move
+                    best_visits = node.visits
+                if node.seat is not None:
+                    if winner == node.seat:
+                        node.reward += 1
+                    elif winner is None:
+                        node.reward += 0.5
+                node = node.parent
+
+        return best_move
+
+    def compute_best_attack_move(self):
+        """
+        Search the best attack or throw-in
+        :return: The card to play, None to finish the turn
+        """
+        return self.search()[1]
+
+    def compute_best_defense_move(self):
+        """
+        Search the best defence
+        :return: The card to play, None to take the cards
+        """
+        return self.search()[1]
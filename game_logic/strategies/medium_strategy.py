@@ -1,26 +1,26 @@
+from game_logic.engine.cards import SUITS, SUIT_MASKS, RANK_MASKS, card_rank, card_suit, card_value, iter_cards, \
+    lowest_card, lowest_value_card
+from game_logic.engine.canonical import suit_slots
+from game_logic.engine.durak_engine import DurakEngine
 from game_logic.strategies.computer_strategy import Strategy
-from play_areas.playground import Playground
-from play_areas.not_active_cards import NotActiveCards
-from play_areas.player_area import PlayerArea
 
 
 class MediumStrategy(Strategy):
-    def __init__(self, computer_area: PlayerArea, main_card_sprites_playing_area: Playground,
-                 not_active_cards: NotActiveCards, player_area: PlayerArea):
-        super().__init__(computer_area, main_card_sprites_playing_area, not_active_cards, player_area)
-        self.all_possible_cards = {"Clubs": [6, 7, 8, 9, 10, 11, 12, 13, 14],
-                                   "Diamonds": [6, 7, 8, 9, 10, 11, 12, 13, 14],
-                                   "Hearts": [6, 7, 8, 9, 10, 11, 12, 13, 14],
-                                   "Spades": [6, 7, 8, 9, 10, 11, 12, 13, 14]}
+    def __init__(self, engine: DurakEngine, seat: int):
+        super().__init__(engine, seat)
 
-    def remove_played_cards(self):
+    def decision_view(self, is_attack):
+        # Only the first card of a turn needs the summaries of the hand and of the cards that are not played yet, the
+        # other moves are cheaper to compute than to look up
+        if not is_attack or len(self.engine.table) > 0:
+            return None
+        return self.attack_masks(), ()
+
+    def attack_masks(self):
         """
-        Remove the played cards from the bot's hand
+        :return: The masks the first attack of a turn depends on, the hand and the cards that are not played yet
         """
-        played_cards = self.not_active_cards.played_cards
-        for card in played_cards:
-            if card in self.all_possible_cards[card.suit]:
-                self.all_possible_cards[card.suit].remove(card.value)
+        return self.hand, self.tracker.unplayed
 
     def calc_bot_hand(self):
         """
@@ -29,11 +29,10 @@ class MediumStrategy(Strategy):
         """
         # get the available card suits
         available_cards = {}
-        for card in self.computer_area.cards:
-            if card.suit != self.not_active_cards.trump_card.suit:
-                if card.suit not in available_cards:
-                    available_cards[card.suit] = []
-                available_cards[card.suit].append(card.value)
+        for card in iter_cards(self.hand & ~SUIT_MASKS[self.engine.trump_suit]):
+            if card_suit(card) not in available_cards:
+                available_cards[card_suit(card)] = []
+            available_cards[card_suit(card)].append(card_value(card))
         return available_cards
 
     def highest_values(self, bot_hand):
@@ -55,7 +54,9 @@ class MediumStrategy(Strategy):
         :param bot_cards: The bot's hand with only the highest values
         :return: A dictionary with the reduced cards
         """
-        help_dict = self.all_possible_cards.copy()
+        # The values of the cards that are not played yet, the tracker keeps them up to date
+        help_dict = {suit: [card_value(card) for card in iter_cards(self.tracker.unplayed_cards(suit))]
+                     for suit in range(len(SUITS))}
         for suit in bot_cards:
             # Remove all cards that are lower than the highest card in the suit
             help_dict[suit] = [card for card in help_dict[suit] if card > bot_cards[suit]]
@@ -64,14 +65,21 @@ class MediumStrategy(Strategy):
 
     def find_card(self, suit, value):
         """
-        Find the instance card with the given suit and value
+        Find the card with the given suit and value
         :param suit: The suit of the card
         :param value: The value of the card
-        :return: The instance card
+        :return: The card
+        """
+        return lowest_card(self.engine.cards_with_suit(self.seat, suit) &
+                           self.engine.cards_with_value(self.seat, value))
+
+    def lowest_value_card_in_hand(self, slots):
+        """
+        :param slots: The slot of every suit, see suit_slots
+        :return: A card with the lowest value in the hand, of the cards with the same value the one in the lowest slot
         """
-        suit_lst = self.computer_area.get_cards_with_same_suit_str(suit)
-        value_lst = self.computer_area.get_cards_with_same_value_int(value)
-        return suit_lst.intersection(value_lst)
+        cards = self.hand & RANK_MASKS[card_rank(lowest_value_card(self.hand))]
+        return min(iter_cards(cards), key=lambda card: slots[card_suit(card)])
 
     def compute_best_attack_move(self):
         """
@@ -80,47 +88,27 @@ class MediumStrategy(Strategy):
         value in that suit
         :return: The card that the bot should play
         """
-        card_to_play = None
-        self.remove_played_cards()
         bot_cards = self.calc_bot_hand()
-        if len(self.playground.mat_list) == 1:
+        if len(self.engine.table) == 0:
             highest_values = self.highest_values(bot_cards)
             help_dict = self.reduce_dict(highest_values)
-            # Get the suit with the shortest list
-            suit = min(help_dict, key=lambda suit: len(help_dict[suit]))
+            # Get the suit with the shortest list, of two suits with lists of the same length the one in the lower slot
+            slots = suit_slots(self.engine.trump_suit, self.attack_masks())
+            suit = min(help_dict, key=lambda suit: (len(help_dict[suit]), slots[suit]))
 
-            # If suit is a set, get the first element without remove it from the set
-            if isinstance(suit, set):
-                suit = next(iter(suit))
-
-            # Check if the suit is in the keys of the highest_values dict, which should be the case, but somehow in the
-            # end of the game might be not
+            # Check if the suit is in the keys of the highest_values dict, which is not the case if the bot has only
+            # trump cards left
             if suit in highest_values:
                 card_to_play = self.find_card(suit, highest_values[suit])
             else:
                 # Get the card with the lowest value
-                card_to_play = min(self.computer_area.cards, key=lambda card: card.value)
-
-            # What if bot has only trump cards?
-            if card_to_play is None and len(bot_cards[self.not_active_cards.trump_card.suit]) > 0:
-                card_to_play = min(bot_cards[self.not_active_cards.trump_card.suit])
-                card_to_play = self.find_card(self.not_active_cards.trump_card.suit, card_to_play)
-
-            # If card_to_play is a set, get the first element
-            if isinstance(card_to_play, set):
-                card_to_play = card_to_play.pop()
+                card_to_play = self.lowest_value_card_in_hand(slots)
 
         else:
-            # Get all the unused_cards from the main area
-            cards = self.playground.get_all_cards()
-            playable_cards = set()
-            # Get the unused_cards with the same value
-            for card in cards:
-                playable_cards.update(self.computer_area.get_cards_with_same_value_as_card(card))
-                # Filter out the unused_cards with the same suit as the trump card
-                playable_cards = {card for card in playable_cards if card.suit != self.not_active_cards.trump_card.suit}
-                # Get the card with the lowest value
-                card_to_play = min(playable_cards, key=lambda card: card.value, default=None)
+            # Get the cards that may be thrown in, without the trump cards
+            playable_cards = self.engine.attack_cards(self.seat) & ~SUIT_MASKS[self.engine.trump_suit]
+            # Get the card with the lowest value
+            card_to_play = lowest_value_card(playable_cards)
 
         return card_to_play
 
@@ -129,20 +117,14 @@ class MediumStrategy(Strategy):
         Compute the best defence move by trying to play the lowest possible card.
         :return: The card that the bot should play
         """
-        # Filter out the unused_cards that are not playable
-        bottom_card = self.playground.get_bottom_card()
-        # Filter the computer_area cards with the same suit as the bottom card
-        cards_with_same_suit = self.computer_area.get_cards_with_same_suit_as_card(bottom_card)
-        # Get the card with the lowest value that is higher than the bottom card from cards_with_same_suit
-        # Filter out the cards that have a value lower than the bottom card
-        cards_with_same_suit = {card for card in cards_with_same_suit if card.value > bottom_card.value}
-        # Get the card with the lowest value
-        card_to_play = min(cards_with_same_suit, key=lambda card: card.value, default=None)
-
-        if card_to_play is None and bottom_card.suit != self.not_active_cards.trump_card.suit:
-            trump_cards = self.computer_area.get_cards_with_same_suit_as_card(self.not_active_cards.trump_card)
-            if len(trump_cards) > 0:
-                card_to_play = min(trump_cards, key=lambda card: card.value)
+        # Get the cards in the hand that beat the bottom card
+        beating_cards = self.engine.defence_cards(self.seat)
+        # Take the lowest card that is not a trump, which is a higher card of the same suit
+        card_to_play = lowest_card(beating_cards & ~SUIT_MASKS[self.engine.trump_suit])
+
+        if card_to_play is None:
+            # Only trump cards are left, take the lowest of them
+            card_to_play = lowest_card(beating_cards)
 
         return card_to_play
 
@@ -1,13 +1,35 @@
+import threading
+import time
+
+from game_logic.engine.canonical import canonical_view, canonical_card, actual_card
+from game_logic.engine.durak_engine import DurakEngine
 from game_logic.strategies.computer_strategy import Strategy
 
+# Stands for a decision the cache doesn't know, a known decision can be None
+_NOT_CACHED = object()
+
 
 class StrategyContext:
-    def __init__(self, strategy: Strategy, playground, computer_area) -> None:
-        self.playground = playground
-        self.computer_area = computer_area
+    def __init__(self, strategy: Strategy, engine: DurakEngine, transposition_table=None, decision_cache=None) -> None:
+        """
+        :param transposition_table: A TranspositionTable the strategies of this context search with, the shared table of
+        the process if None
+        :param decision_cache: A DecisionCache that remembers the moves of the rule based strategies, the moves are
+        computed every time if None
+        """
+        self.engine = engine
+        self.transposition_table = transposition_table
+        self.decision_cache = decision_cache
         self.__strategy = strategy
-        self.is_turn = False
-        self.is_attack = False
+        if transposition_table is not None:
+            strategy.use_transposition_table(transposition_table)
+
+        # State of a move that is computed on a worker thread
+        self.worker = None
+        self.thinking_strategy = None
+        self.is_attack = True
+        self.computed_card = None
+        self.start_time = 0
 
     @property
     def strategy(self) -> Strategy:
@@ -16,30 +38,94 @@ class StrategyContext:
     @strategy.setter
     def strategy(self, strategy: Strategy) -> None:
         self.__strategy = strategy
+        if self.transposition_table is not None:
+            strategy.use_transposition_table(self.transposition_table)
 
     def make_computer_move(self, is_attack):
-        card_to_play = self.pick_card(is_attack)
-        if card_to_play is not None:
-            card_to_play.face_up()
-            # Add the card and mat to the main area
-            self.playground.add_new_card(card_to_play)
-            # Remove the card and mat from the computer_area area
-            self.computer_area.remove_card(card_to_play)
-            return True
-        elif card_to_play is None:
-            return False
-
-    def pick_card(self, is_attack):
+        """
+        Let the strategy pick a card and play it in the engine
+        :param is_attack: True for an attack move, False for a defence move
+        :return: The played card, or None if the computer could not or did not want to play
+        """
+        return self.play_card(self.pick_card(is_attack, self.strategy), is_attack)
+
+    def start_computer_move(self, is_attack):
+        """
+        Let the strategy pick a card on a worker thread. The worker searches on a snapshot of the engine, so the game
+        can go on drawing while it thinks. finish_computer_move plays the card later.
+        :param is_attack: True for an attack move, False for a defence move
+        """
+        self.is_attack = is_attack
+        self.computed_card = None
+        self.thinking_strategy = self.strategy.bind(self.engine.copy())
+        self.worker = threading.Thread(target=self.compute_card, args=(self.thinking_strategy, is_attack), daemon=True)
+        self.start_time = time.perf_counter()
+        self.worker.start()
+
+    def compute_card(self, strategy, is_attack):
+        self.computed_card = self.pick_card(is_attack, strategy)
+
+    @property
+    def is_thinking(self):
+        return self.worker is not None
+
+    @property
+    def is_move_ready(self):
+        return self.worker is not None and not self.worker.is_alive()
+
+    @property
+    def thinking_time(self):
+        """ The seconds since the worker started """
+        return time.perf_counter() - self.start_time
+
+    def finish_computer_move(self):
+        """
+        Play the card the worker picked. If the worker is still searching it is told to stop, and the best card it has
+        found so far is played.
+        :return: The played card, or None if the computer could not or did not want to play
+        """
+        if self.worker is None:
+            return None
+        self.thinking_strategy.stop()
+        self.worker.join()
+        self.worker = None
+        self.thinking_strategy = None
+        return self.play_card(self.computed_card, self.is_attack)
+
+    def play_card(self, card_to_play, is_attack):
+        """
+        Play a picked card in the engine
+        :return: The played card, or None if there was no card or it could not be played
+        """
+        if card_to_play is None:
+            return None
         if is_attack:
-            return self.strategy.compute_best_attack_move()
+            played = self.engine.attack(self.strategy.seat, card_to_play)
         else:
-            return self.strategy.compute_best_defense_move()
+            played = self.engine.defend(self.strategy.seat, card_to_play)
+        return card_to_play if played else None
 
-    def validate_defence_move(self, bottom_card, top_card):
-        return self.strategy.validate_defence_move(bottom_card, top_card)
+    def pick_card(self, is_attack, strategy):
+        if strategy.hand == 0:
+            return None
+        view = None if self.decision_cache is None else strategy.decision_view(is_attack)
+        if view is None:
+            return self.compute_decision(is_attack, strategy)
 
-    def validate_attack_move(self, card):
-        return self.strategy.validate_attack_move(card)
+        # The cache stores the card with its suit replaced by the slot of the suit, so games that only differ by the
+        # names of the suits that aren't trump share their decisions
+        masks, values = view
+        key, suit_order = canonical_view(strategy.engine.trump_suit, masks)
+        key = (type(strategy), is_attack, key, values)
+        card = self.decision_cache.get(key, _NOT_CACHED)
+        if card is _NOT_CACHED:
+            card = self.compute_decision(is_attack, strategy)
+            self.decision_cache.put(key, None if card is None else canonical_card(card, suit_order))
+            return card
+        return None if card is None else actual_card(card, suit_order)
 
-    def take_cards_from_main_area(self):
-        return self.playground.get_and_remove_all_cards()
+    def compute_decision(self, is_attack, strategy):
+        if is_attack:
+            return strategy.compute_best_attack_move()
+        else:
+            return strategy.compute_best_defense_move()
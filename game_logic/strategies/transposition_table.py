@@ -0,0 +1,95 @@
+from Constants import TRANSPOSITION_TABLE_SIZE
+
+
+class TranspositionTable:
+    """
+    A fixed-size table of search results, indexed by the Zobrist hash of the position. Every hash has one slot. A new
+    result replaces an old one if the slot is empty, if the old result is from an earlier search, or if the new result
+    took at least as much work (its depth is at least as high).
+    """
+
+    def __init__(self, size=TRANSPOSITION_TABLE_SIZE):
+        """
+        :param size: The number of slots, rounded down to a power of two
+        """
+        self.size = 1 << (size.bit_length() - 1)
+        self.index_mask = self.size - 1
+        # Every slot holds None or a tuple with the hash, the depth, the search generation and the stored entry
+        self.slots = [None] * self.size
+        self.generation = 0
+
+        # Counters to size the table
+        self.used_slots = 0
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+        self.replacements = 0
+        self.rejections = 0
+
+    def new_search(self):
+        """ Results stored from now on are preferred over the results of earlier searches """
+        self.generation += 1
+
+    def probe(self, zobrist_hash):
+        """
+        :param zobrist_hash: The hash of the position
+        :return: The stored entry of the position, None if there is none
+        """
+        self.probes += 1
+        slot = self.slots[zobrist_hash & self.index_mask]
+        if slot is not None and slot[0] == zobrist_hash:
+            self.hits += 1
+            return slot[3]
+        return None
+
+    def store(self, zobrist_hash, entry, depth):
+        """
+        :param zobrist_hash: The hash of the position
+        :param entry: The result to store
+        :param depth: How much work the result took, results with a higher depth are kept longer
+        """
+        index = zobrist_hash & self.index_mask
+        slot = self.slots[index]
+        if slot is None:
+            self.used_slots += 1
+        elif slot[0] != zobrist_hash:
+            if slot[2] == self.generation and slot[1] > depth:
+                self.rejections += 1
+                return
+            self.replacements += 1
+        self.stores += 1
+        self.slots[index] = (zobrist_hash, depth, self.generation, entry)
+
+    @property
+    def hit_rate(self):
+        return self.hits / self.probes if self.probes > 0 else 0
+
+    @property
+    def occupancy(self):
+        return self.used_slots / self.size
+
+    def reset_counters(self):
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+        self.replacements = 0
+        self.rejections = 0
+
+    def clear(self):
+        self.slots = [None] * self.size
+        self.used_slots = 0
+        self.reset_counters()
+
+
+# The table all strategies share unless they are given their own
+_shared_table = None
+
+
+def shared_transposition_table():
+    """
+    :return: The transposition table of this process, it is created on the first call
+    """
+    global _shared_table
+    if _shared_table is None:
+        _shared_table = TranspositionTable()
+    return _shared_table
@@ -0,0 +1,194 @@
+import math
+import time
+from multiprocessing import Pool
+
+from Constants import PLAYER_AREA, COMPUTER_AREA, SPRT_ELO0, SPRT_ELO1, SPRT_ALPHA, SPRT_BETA, ELO_CONFIDENCE_Z
+from game_logic.self_play import STRATEGIES, play_seeded_game
+
+# Results of the SPRT
+H0_ACCEPTED = "H0"
+H1_ACCEPTED = "H1"
+
+
+def elo_to_score(elo):
+    """
+    :return: The expected score of a player that is elo points stronger than the opponent, between 0 and 1
+    """
+    return 1 / (1 + 10 ** (-elo / 400))
+
+
+def score_to_elo(score):
+    """
+    :param score: The average score of a player, strictly between 0 and 1
+    :return: The Elo difference that is expected to give this score
+    """
+    return 400 * math.log10(score / (1 - score))
+
+
+class PairStats:
+    """
+    Results of a duplicate match from the point of view of the first strategy. Every deck is played twice with the
+    seats swapped, and the two games count as one pair. A pair scores 0, 0.5, 1, 1.5 or 2 points, so the luck of the
+    deal mostly cancels out.
+    """
+
+    def __init__(self):
+        # The number of pairs with each score, indexed by twice the score
+        self.pair_counts = [0] * 5
+        self.wins = 0
+        self.losses = 0
+        self.draws = 0
+
+    def add_pair(self, scores):
+        """
+        :param scores: The scores of the first strategy in both games of the pair, 1 for a win, 0.5 for a draw and 0
+        for a loss
+        """
+        self.pair_counts[int(2 * sum(scores))] += 1
+        for score in scores:
+            if score == 1:
+                self.wins += 1
+            elif score == 0:
+                self.losses += 1
+            else:
+                self.draws += 1
+
+    def merge(self, other):
+        self.pair_counts = [count + other_count for count, other_count in zip(self.pair_counts, other.pair_counts)]
+        self.wins += other.wins
+        self.losses += other.losses
+        self.draws += other.draws
+
+    @property
+    def pairs(self):
+        return sum(self.pair_counts)
+
+    @property
+    def games(self):
+        return 2 * self.pairs
+
+    @property
+    def score(self):
+        """ The average score per game """
+        if self.pairs == 0:
+            return 0.5
+        return sum(index / 4 * count for index, count in enumerate(self.pair_counts)) / self.pairs
+
+    @property
+    def variance(self):
+        """ The variance of the average game score of a pair, the pairs are the independent samples """
+        if self.pairs == 0:
+            return 0
+        score = self.score
+        return sum((index / 4 - score) ** 2 * count for index, count in enumerate(self.pair_counts)) / self.pairs
+
+    @property
+    def elo(self):
+        return self.elo_of(self.score)
+
+    def elo_interval(self, z=ELO_CONFIDENCE_Z):
+        """
+        :param z: The number of standard errors on both sides, 1.96 for 95% confidence
+        :return: A tuple with the lower and the upper bound of the Elo difference
+        """
+        if self.pairs == 0:
+            return -math.inf, math.inf
+        error = z * math.sqrt(self.variance / self.pairs)
+        return self.elo_of(self.score - error), self.elo_of(self.score + error)
+
+    @staticmethod
+    def elo_of(score):
+        # A score of 0 or 1 means an unbounded difference
+        if score <= 0:
+            return -math.inf
+        if score >= 1:
+            return math.inf
+        return score_to_elo(score)
+
+    def llr(self, elo0=SPRT_ELO0, elo1=SPRT_ELO1):
+        """
+        The log-likelihood ratio of the hypothesis that the first strategy is elo1 stronger against the hypothesis that
+        it is elo0 stronger, with the normal approximation of the pair scores
+        :return: The log-likelihood ratio, 0 while there are too few pairs to estimate the variance
+        """
+        variance = self.variance
+        if self.pairs < 2 or variance == 0:
+            return 0
+        score0, score1 = elo_to_score(elo0), elo_to_score(elo1)
+        return self.pairs * (score1 - score0) * (2 * self.score - score0 - score1) / (2 * variance)
+
+    def sprt(self, elo0=SPRT_ELO0, elo1=SPRT_ELO1, alpha=SPRT_ALPHA, beta=SPRT_BETA):
+        """
+        Sequential probability ratio test, it can be checked after every batch of pairs
+        :param alpha: The chance to accept H1 when H0 is true
+        :param beta: The chance to accept H0 when H1 is true
+        :return: H1_ACCEPTED, H0_ACCEPTED, or None if more pairs are needed
+        """
+        llr = self.llr(elo0, elo1)
+        if llr >= math.log((1 - beta) / alpha):
+            return H1_ACCEPTED
+        if llr <= math.log(beta / (1 - alpha)):
+            return H0_ACCEPTED
+        return None
+
+
+def score_of(winner, seat):
+    if winner is None:
+        return 0.5
+    return 1 if winner == seat else 0
+
+
+def play_pairs(job):
+    """
+    Play a batch of duplicate pairs in a worker process
+    :param job: A tuple with the names of both strategies, the base seed, the first pair index and the number of pairs
+    :return: The PairStats of the batch
+    """
+    first_name, second_name, base_seed, start, count = job
+    first_strategy = STRATEGIES[first_name]
+    second_strategy = STRATEGIES[second_name]
+    stats = PairStats()
+    for index in range(start, start + count):
+        # The same deck is played once from every seat
+        scores = []
+        for seat in (PLAYER_AREA, COMPUTER_AREA):
+            winner, turns = play_seeded_game(first_strategy, second_strategy, base_seed + index, seat)
+            scores.append(score_of(winner, seat))
+        stats.add_pair(scores)
+    return stats
+
+
+def run_tournament(first_name, second_name, max_pairs, base_seed=0, workers=None, batch_size=100, elo0=SPRT_ELO0,
+                   elo1=SPRT_ELO1, alpha=SPRT_ALPHA, beta=SPRT_BETA):
+    """
+    Play duplicate pairs between two strategies until the SPRT decides or max_pairs are played. The batches are merged
+    in order, so the same seeds always stop after the same batch.
+    :param first_name: The name of the first strategy, see STRATEGIES
+    :param second_name: The name of the second strategy
+    :param max_pairs: The maximum number of decks to play, every deck is played twice
+    :param base_seed: The seed of the first deck, deck n is shuffled with base_seed + n
+    :param workers: The number of worker processes, None for one per CPU
+    :param batch_size: The number of pairs a worker plays before the test is checked again
+    :return: A tuple with the PairStats, the result of the SPRT (None if it didn't decide) and the elapsed time in
+    seconds
+    """
+    jobs = [(first_name, second_name, base_seed, start, min(batch_size, max_pairs - start))
+            for start in range(0, max_pairs, batch_size)]
+    stats = PairStats()
+    result = None
+    start_time = time.perf_counter()
+    if workers == 1:
+        for job in jobs:
+            stats.merge(play_pairs(job))
+            result = stats.sprt(elo0, elo1, alpha, beta)
+            if result is not None:
+                break
+    else:
+        # Leaving the pool stops the workers that are still playing
+        with Pool(workers) as pool:
+            for batch_stats in pool.imap(play_pairs, jobs):
+                stats.merge(batch_stats)
+                result = stats.sprt(elo0, elo1, alpha, beta)
+                if result is not None:
+                    break
+    return stats, result, time.perf_counter() - start_time
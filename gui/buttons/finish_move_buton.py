@@ -11,8 +11,6 @@ class FinishMoveButton(arcade.gui.UIFlatButton):
         self.computer = computer
 
     def on_click(self, event):
-
-        if len(self.playground.get_cards()[-1]) == 0:
-            self.game_logic.finish_player_or_bot_turn()
+        self.game_logic.finish_player_or_bot_turn()
 
 
@@ -11,7 +11,4 @@ class TakeCardsButton(arcade.gui.UIFlatButton):
         self.human = human
 
     def on_click(self, event):
-        if self.human.is_turn and len(self.playground.get_cards()[-1]) == 1:
-            self.human.is_turn = False
-            self.human.is_taking = True
-            self.game_logic.take_all_cards_human()
+        self.game_logic.take_all_cards_human()
@@ -1,14 +1,20 @@
-import math
-import os
-
 import arcade
 
+from Constants import CARD_MOVE_DURATION
+from game_logic.engine.cards import card_from_name
+from gui.card_animator import EASE_OUT
+from gui.card_textures import CardTextures
+
 
 class Card(arcade.Sprite):
     """ Card sprite """
 
-    def __init__(self, suit, value, scale=1):
-        """ Card constructor """
+    def __init__(self, suit, value, scale=1, animator=None):
+        """
+        Card constructor
+        :param animator: The CardAnimator that moves the cards of the game, without one the card jumps to its
+        destination
+        """
 
         # Attributes for suit and value
         self.suit = suit
@@ -17,22 +23,10 @@ class Card(arcade.Sprite):
         self.original_card_index = None
         self.current_card_area = None
         self.current_card_index = None
+        self.animator = animator
 
-        # This list is needed so that the card can be moved to multiple points
-        self.destination_points = []
-
-        # get current working directory
-        cwd = os.getcwd()
-
-        # get the path to the images folder
-        images_path = os.path.join(cwd, "playing_cards")
-
-        # Face down image
-        self.face_down_image = f"{images_path}/cardBack_black2.png"
-
-        # Image to use for the sprite when face up and defining the value
+        # Defining the value
         if self.value == "jack" or self.value == "queen" or self.value == "king" or self.value == "ace":
-            self.image_file_name = f"{images_path}/{self.value}_of_{self.suit}2.png"
             if self.value == "jack":
                 self.value = 11
             elif self.value == "queen":
@@ -42,26 +36,26 @@ class Card(arcade.Sprite):
             elif self.value == "ace":
                 self.value = 14
         else:
-            self.image_file_name = f"{images_path}/{self.value}_of_{self.suit}.png"
             self.value = int(self.value)
 
-        self.is_face_up = False
+        # The encoded card the rules engine works with
+        self.code = card_from_name(self.suit, self.value)
 
-        # Destination point is where we are going
-        self._destination_point = None
+        # The textures are shared by all cards, flipping a card only swaps the texture reference
+        self.textures_cache = CardTextures()
 
-        self.x_diff = 0
-        self.y_diff = 0
-        super().__init__(self.face_down_image, scale, hit_box_algorithm="None")
+        self.is_face_up = False
+
+        super().__init__(scale=scale, texture=self.textures_cache.back)
 
     def face_down(self):
         """ Turn card face-down """
-        self.texture = arcade.load_texture(self.face_down_image)
+        self.texture = self.textures_cache.back
         self.is_face_up = False
 
     def face_up(self):
         """ Turn card face-up """
-        self.texture = arcade.load_texture(self.image_file_name)
+        self.texture = self.textures_cache.face(self.code)
         self.is_face_up = True
 
     @property
@@ -71,50 +65,46 @@ class Card(arcade.Sprite):
 
     @property
     def destination_point(self):
-        return self._destination_point
+        """ The point the card comes to rest at, None if it doesn't move """
+        if self.animator is None:
+            return None
+        return self.animator.destination(self)
 
     @destination_point.setter
     def destination_point(self, destination_point):
-        # If there is a destination point, save the new destination point to the list
-        if self._destination_point:
-            self.destination_points.append(destination_point)
-        else:
-            self._destination_point = destination_point
+        # A card that is moving already goes there after its other destination points
+        self.move_to(destination_point)
 
-    def on_update(self, delta_time: float = 1 / 100):
-        if not self._destination_point:
-            return
-
-        # Get the current position
-        current_x = self.center_x
-        current_y = self.center_y
-
-        # Get the destination position
-        dest_x, dest_y = self._destination_point
-
-        # Calculate the speed in the x and y directions
-        if self.x_diff == 0 and self.y_diff == 0:
-            self.x_diff = (dest_x - current_x) / 60
-            self.y_diff = (dest_y - current_y) / 60
-
-        # Set the sprite's speed
-
-        self.change_x = self.x_diff
-        self.change_y = self.y_diff
-
-        # Update the sprite
-        super().update()
-
-        # Set the center of the card to the destination point if we are close enough to it and the destination point
-        # to none
-        if math.isclose(current_x, dest_x, abs_tol=50) and math.isclose(current_y, dest_y, abs_tol=50):
-            self.center_x = dest_x
-            self.center_y = dest_y
-            self.x_diff = 0
-            self.y_diff = 0
+    @property
+    def is_moving(self):
+        return self.animator is not None and self.animator.is_moving(self)
+
+    def move_to(self, point, rotation=0, duration=CARD_MOVE_DURATION, easing=EASE_OUT):
+        """
+        Move the card to a point after the points it is already moving to
+        :param point: The (x, y) tuple of the destination
+        :param rotation: The degrees the card turns on the way
+        :param duration: The seconds the move takes
+        :param easing: The easing of the move, see CardAnimator
+        """
+        if self.animator is None:
+            self.position = point
+            self.angle += rotation
+        else:
+            self.animator.move_to(self, point, rotation, duration, easing)
+
+    def change_destination(self, point):
+        """
+        Let the card come to rest at another point than its last destination point, for example when its hand is laid
+        out again
+        :param point: The (x, y) tuple of the new destination
+        """
+        if self.animator is None:
+            self.position = point
+        else:
+            self.animator.change_destination(self, point)
 
-            # If there are more destination points, set the next one as the destination point
-            if len(self.destination_points) > 0:
-                self._destination_point = self.destination_points.pop(0)
-            else:
-                self._destination_point = None
+    def stop_moving(self):
+        """ Forget all destination points, the card stays where it is """
+        if self.animator is not None:
+            self.animator.stop(self)
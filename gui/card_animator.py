@@ -0,0 +1,192 @@
+from collections import deque
+
+import numpy as np
+
+from Constants import CARD_MOVE_DURATION
+from game_logic.engine.cards import DECK_SIZE
+
+
+def linear(progress):
+    return progress
+
+
+def ease_out(progress):
+    # Fast at the start, slowing down towards the destination
+    return 1 - (1 - progress) ** 2
+
+
+def ease_in_out(progress):
+    # Slow at both ends, fastest halfway
+    return np.where(progress < 0.5, 4 * progress ** 3, 1 - (2 - 2 * progress) ** 3 / 2)
+
+
+# The easing functions map the progress of a move to the share of the way the card has covered. A card stores the
+# index of its easing, so the cards with the same easing are eased with one array operation.
+EASINGS = [linear, ease_out, ease_in_out]
+LINEAR = 0
+EASE_OUT = 1
+EASE_IN_OUT = 2
+
+
+class CardAnimator:
+    """
+    Moves all cards of a game at once. Every card has a slot, indexed by its code, that holds the start and the target
+    of its current move, the progress of the move, its duration and its easing. One update advances every move by the
+    time since the last update with a few array operations and then writes the new positions back to the sprites that
+    moved. A move takes the same time at every frame rate.
+    """
+
+    def __init__(self):
+        # The sprite of every slot, a slot belongs to the last sprite with its code that was moved
+        self.sprites = [None] * DECK_SIZE
+        self.start = np.zeros((DECK_SIZE, 2))
+        self.target = np.zeros((DECK_SIZE, 2))
+        self.progress = np.zeros(DECK_SIZE)
+        # The seconds every move takes
+        self.duration = np.ones(DECK_SIZE)
+        self.easing = np.zeros(DECK_SIZE, dtype=np.int8)
+        # The angle at the start of the move and the degrees the card turns until it arrives
+        self.start_angle = np.zeros(DECK_SIZE)
+        self.rotation = np.zeros(DECK_SIZE)
+        # The slots of the cards that are moving. A card enters when it gets a destination and leaves when it comes
+        # to rest, only these slots are updated.
+        self.animating = set()
+        # The moves that follow the current one, as (point, rotation, duration, easing) tuples
+        self.waypoints = [deque() for _ in range(DECK_SIZE)]
+
+    @property
+    def is_animating(self):
+        return len(self.animating) > 0
+
+    def owns(self, card):
+        return self.sprites[card.code] is card
+
+    def is_moving(self, card):
+        return card.code in self.animating and self.owns(card)
+
+    def is_any_moving(self, cards):
+        """
+        :param cards: A sprite list of cards
+        :return: True if a card of the list moves, only the moving cards are looked at
+        """
+        for slot in self.animating:
+            if cards in self.sprites[slot].sprite_lists:
+                return True
+        return False
+
+    def move_to(self, card, point, rotation=0, duration=CARD_MOVE_DURATION, easing=EASE_OUT):
+        """
+        Move a card to a point, after the moves it already has
+        :param card: The card sprite
+        :param point: The (x, y) tuple of the destination
+        :param rotation: The degrees the card turns on the way
+        :param duration: The seconds the move takes, more than 0
+        :param easing: The index of the easing function, see EASINGS
+        """
+        slot = card.code
+        if slot in self.animating and self.owns(card):
+            # A card that already goes there doesn't wait for a move that stays in place
+            if tuple(point) != self.destination(card):
+                self.waypoints[slot].append((point, rotation, duration, easing))
+            return
+        self.sprites[slot] = card
+        self.waypoints[slot].clear()
+        self.start_move(slot, point, rotation, duration, easing)
+
+    def change_destination(self, card, point, duration=CARD_MOVE_DURATION, easing=EASE_OUT):
+        """
+        Let a card end its moves at another point. A card that is on its last move turns towards the point right away,
+        a card at rest starts a new move.
+        :param card: The card sprite
+        :param point: The (x, y) tuple of the new destination
+        """
+        slot = card.code
+        if slot not in self.animating or not self.owns(card):
+            self.move_to(card, point, duration=duration, easing=easing)
+        elif len(self.waypoints[slot]) > 0:
+            _, rotation, duration, easing = self.waypoints[slot][-1]
+            self.waypoints[slot][-1] = point, rotation, duration, easing
+        elif tuple(point) != self.destination(card):
+            # The card keeps turning to the angle it was going to have
+            rotation = self.start_angle[slot] + self.rotation[slot] - card.angle
+            self.start_move(slot, point, rotation, duration, easing)
+
+    def start_move(self, slot, point, rotation, duration, easing):
+        """ Start a move from where the sprite of the slot is right now """
+        sprite = self.sprites[slot]
+        self.start[slot] = sprite.center_x, sprite.center_y
+        self.target[slot] = point
+        self.start_angle[slot] = sprite.angle
+        self.rotation[slot] = rotation
+        self.duration[slot] = duration
+        self.easing[slot] = easing
+        self.progress[slot] = 0
+        self.animating.add(slot)
+
+    def destination(self, card):
+        """
+        :return: The (x, y) tuple the card comes to rest at, None if it doesn't move
+        """
+        slot = card.code
+        if slot not in self.animating or not self.owns(card):
+            return None
+        if len(self.waypoints[slot]) > 0:
+            return self.waypoints[slot][-1][0]
+        return tuple(self.target[slot].tolist())
+
+    def stop(self, card):
+        """ Forget all moves of the card, it stays where it is """
+        if self.owns(card):
+            self.animating.discard(card.code)
+            self.waypoints[card.code].clear()
+
+    def update(self, delta_time):
+        """
+        Advance every move
+        :param delta_time: The seconds since the last update
+        """
+        if len(self.animating) == 0:
+            return
+        moving = np.fromiter(self.animating, dtype=np.intp, count=len(self.animating))
+        durations = self.duration[moving]
+        progress = self.progress[moving] + delta_time / durations
+        # Summed steps miss 1 by a rounding error, a move that is that close has arrived
+        is_done = progress >= 1 - 1e-9
+        # The time a finished move ran past its end already belongs to the next move of the card
+        overtimes = np.maximum(progress - 1, 0) * durations
+        progress[is_done] = 1
+        self.progress[moving] = progress
+
+        eased = progress.copy()
+        easings = self.easing[moving]
+        for index in range(LINEAR + 1, len(EASINGS)):
+            selected = easings == index
+            if selected.any():
+                eased[selected] = EASINGS[index](progress[selected])
+
+        start = self.start[moving]
+        positions = start + (self.target[moving] - start) * eased[:, None]
+        rotations = self.rotation[moving]
+        angles = self.start_angle[moving] + rotations * eased
+
+        # Only the sprites that moved are written, and only the cards that turn get a new angle
+        for slot, (x, y), angle, rotation, is_done, overtime in zip(moving.tolist(), positions.tolist(),
+                                                                      angles.tolist(), rotations.tolist(),
+                                                                      is_done.tolist(), overtimes.tolist()):
+            sprite = self.sprites[slot]
+            sprite.position = x, y
+            if rotation != 0:
+                sprite.angle = angle
+            if is_done:
+                self.finish_move(slot, overtime)
+
+    def finish_move(self, slot, overtime=0):
+        """
+        Start the next move of a card that arrived, or let it rest
+        :param overtime: The seconds the card already spent on its next move
+        """
+        if len(self.waypoints[slot]) > 0:
+            self.start_move(slot, *self.waypoints[slot].popleft())
+            self.progress[slot] = min(overtime / self.duration[slot], 1)
+        else:
+            self.animating.discard(slot)
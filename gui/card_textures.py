@@ -0,0 +1,110 @@
+import os
+
+import arcade
+
+from game_logic.engine.cards import DECK_SIZE, SUITS, card_suit, card_value
+
+# Size of the atlas, big enough for the 36 faces and the back of the card images
+ATLAS_SIZE = (4096, 4096)
+
+FACE_CARD_NAMES = {11: "jack", 12: "queen", 13: "king", 14: "ace"}
+
+
+class CardTextures(object):
+    """ Loads every card face and the card back once and keeps them together in one texture atlas """
+    __instance = None
+
+    def __new__(cls, *args, **kwargs):
+        if not cls.__instance:
+            cls.__instance = super(CardTextures, cls).__new__(cls, *args, **kwargs)
+            cls.__instance.__is_loaded = False
+        return cls.__instance
+
+    def __init__(self):
+        # The textures are only loaded the first time
+        if self.__is_loaded:
+            return
+        self.__is_loaded = True
+
+        # get current working directory
+        cwd = os.getcwd()
+
+        # get the path to the images folder
+        images_path = os.path.join(cwd, "playing_cards")
+
+        self.back = arcade.load_texture(f"{images_path}/cardBack_black2.png", hit_box_algorithm="None")
+
+        # The face of every card, indexed by the encoded card
+        self.faces = []
+        for card in range(DECK_SIZE):
+            value = card_value(card)
+            suit = SUITS[card_suit(card)].lower()
+            if value in FACE_CARD_NAMES:
+                file_name = f"{images_path}/{FACE_CARD_NAMES[value]}_of_{suit}2.png"
+            else:
+                file_name = f"{images_path}/{value}_of_{suit}.png"
+            self.faces.append(arcade.load_texture(file_name, hit_box_algorithm="None"))
+
+        # Put all textures into one atlas, so the card sprite lists never have to upload a texture mid-game
+        self.atlas = arcade.TextureAtlas(ATLAS_SIZE)
+        self.atlas.add(self.back)
+        for texture in self.faces:
+            self.atlas.add(texture)
+
+    def face(self, card):
+        """
+        :param card: The encoded card
+        :return: The texture of the face of the card
+        """
+        return self.faces[card]
+
+
+class CardSpriteList(arcade.SpriteList):
+    """ A sprite list that counts its changes, so a renderer can tell when the cards in it changed """
+
+    def __init__(self, *args, **kwargs):
+        self.version = 0
+        super().__init__(*args, **kwargs)
+
+    def append(self, sprite):
+        super().append(sprite)
+        self.version += 1
+
+    def extend(self, sprites):
+        super().extend(sprites)
+        self.version += 1
+
+    def insert(self, index, sprite):
+        super().insert(index, sprite)
+        self.version += 1
+
+    def remove(self, sprite):
+        super().remove(sprite)
+        self.version += 1
+
+    def pop(self, *args, **kwargs):
+        self.version += 1
+        return super().pop(*args, **kwargs)
+
+    def clear(self, *args, **kwargs):
+        super().clear(*args, **kwargs)
+        self.version += 1
+
+    def swap(self, first, second):
+        super().swap(first, second)
+        self.version += 1
+
+    def reverse(self):
+        super().reverse()
+        self.version += 1
+
+    def shuffle(self):
+        super().shuffle()
+        self.version += 1
+
+
+def card_sprite_list():
+    """
+    :return: A new sprite list for cards that draws from the shared card atlas
+    """
+    return CardSpriteList(atlas=CardTextures().atlas)
@@ -0,0 +1,137 @@
+import arcade
+import pyglet
+from arcade.gl import geometry
+
+from Constants import UPDATE_RATE, IDLE_UPDATE_RATE
+
+# Copies a texture over the whole viewport
+_VERTEX_SHADER = """
+#version 330
+in vec2 in_vert;
+in vec2 in_uv;
+out vec2 uv;
+void main() {
+    gl_Position = vec4(in_vert, 0.0, 1.0);
+    uv = in_uv;
+}
+"""
+_FRAGMENT_SHADER = """
+#version 330
+uniform sampler2D layer;
+in vec2 uv;
+out vec4 fragment_color;
+void main() {
+    fragment_color = texture(layer, uv);
+}
+"""
+
+
+def set_draw_rate(window, rate):
+    """
+    Draw the window every rate seconds. arcade 2.6 has no Window.set_draw_rate, there the redraw that pyglet.app.run
+    schedules for all windows is scheduled again with the new rate. That function isn't public, if a pyglet version
+    doesn't have it the window keeps drawing at its normal rate.
+    :param window: The arcade window
+    :param rate: The seconds between two frames
+    :return: True if the draw rate was changed
+    """
+    if hasattr(window, "set_draw_rate"):
+        window.set_draw_rate(rate)
+        return True
+    redraw = getattr(pyglet.app.event_loop, "_redraw_windows", None)
+    if redraw is None:
+        return False
+    pyglet.clock.unschedule(redraw)
+    pyglet.clock.schedule_interval(redraw, rate)
+    return True
+
+
+class CachedLayer:
+    """
+    An offscreen framebuffer of the size of the window. What is drawn into it once is copied to the screen with a single
+    textured quad, until it is marked dirty and drawn again.
+    """
+
+    def __init__(self):
+        self.window = arcade.get_window()
+        self.ctx = self.window.ctx
+        self.program = self.ctx.program(vertex_shader=_VERTEX_SHADER, fragment_shader=_FRAGMENT_SHADER)
+        self.quad = geometry.quad_2d_fs()
+        self.texture = None
+        self.framebuffer = None
+        self.is_dirty = True
+
+    def mark_dirty(self):
+        self.is_dirty = True
+
+    def fit_window(self):
+        """ Create the framebuffer again if the size of the window changed, its content has to be drawn again """
+        size = self.window.get_framebuffer_size()
+        if self.texture is None or self.texture.size != size:
+            self.texture = self.ctx.texture(size, components=4)
+            self.framebuffer = self.ctx.framebuffer(color_attachments=[self.texture])
+            self.is_dirty = True
+
+    def activate(self):
+        """
+        :return: A context manager that draws into the layer, the framebuffer that was active before is used again
+        when it is left
+        """
+        return self.framebuffer.activate()
+
+    def clear(self):
+        self.framebuffer.clear(self.window.background_color)
+
+    def draw(self):
+        """ Copy the layer to the active framebuffer, it replaces what was there """
+        self.texture.use(0)
+        self.ctx.disable(self.ctx.BLEND)
+        self.quad.render(self.program)
+        self.ctx.enable(self.ctx.BLEND)
+
+
+class RenderOnChange:
+    """
+    Lets a view draw its scene only after something changed. The last frame is kept in a CachedLayer and copied to the
+    screen while nothing changes, and the window updates and draws only every IDLE_UPDATE_RATE seconds until something
+    changes again. The view marks the frame dirty on input, animation and changes of the game.
+    """
+
+    def __init__(self):
+        self.window = arcade.get_window()
+        self.frame = CachedLayer()
+        self.is_idle = False
+
+    def mark_dirty(self):
+        self.frame.mark_dirty()
+        self.wake_up()
+
+    def wake_up(self):
+        """ Go back to the normal update and draw rate """
+        if self.is_idle:
+            self.window.set_update_rate(UPDATE_RATE)
+            set_draw_rate(self.window, UPDATE_RATE)
+            self.is_idle = False
+
+    def idle_if_clean(self):
+        """
+        Slow the updates and the frames down if nothing changed since the last frame, called at the end of an update.
+        Copying the clean frame is cheap, but every frame still waits for the flip of the buffers.
+        """
+        if not self.frame.is_dirty and not self.is_idle:
+            self.window.set_update_rate(IDLE_UPDATE_RATE)
+            set_draw_rate(self.window, IDLE_UPDATE_RATE)
+            self.is_idle = True
+
+    def draw(self, draw_scene):
+        """
+        Show the frame, it is drawn again first if it is dirty
+        :param draw_scene: The function that draws the scene of the view, without clearing the screen
+        """
+        self.frame.fit_window()
+        if self.frame.is_dirty:
+            with self.frame.activate():
+                self.frame.clear()
+                draw_scene()
+            self.frame.is_dirty = False
+        self.frame.draw()
@@ -4,6 +4,10 @@ import arcade
 
 
 class ScreenConfiguration:
+    # Draw the views only when something changed, for machines that should save power. It is set for all
+    # configurations at once, before the first view is created.
+    render_on_change = False
+
     def __init__(self):
         self.width = 1920
         self.height = 1080
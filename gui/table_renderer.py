@@ -0,0 +1,131 @@
+import arcade
+
+from gui.card_animator import CardAnimator
+from gui.card_textures import card_sprite_list
+from gui.screen_configuration import ScreenConfiguration
+from play_areas.not_active_cards import NotActiveCards
+from play_areas.player_area import PlayerArea
+from play_areas.playground import Playground
+
+LABEL_COLOR = arcade.color.BLACK
+LABEL_SIZE = 24
+
+
+class TableRenderer:
+    """
+    Draws the table of a game with a few draw calls, in two parts. The static part holds the mats, the talon, the
+    discard pile and the labels, it rarely changes and can be kept in a CachedLayer. The cards of the table and of both
+    hands are drawn on top of it. The cards of each part are drawn from one sprite list, in the order of their layers,
+    and a list is only built again when the cards of one of its layers changed. The labels are text objects that are
+    only laid out again when their text changed.
+    """
+
+    def __init__(self, config: ScreenConfiguration, playground: Playground, not_active_cards: NotActiveCards,
+                 computer_player: PlayerArea, human_player: PlayerArea, animator: CardAnimator):
+        # The areas keep their sprite lists for the whole game, so the renderer can hold on to them
+        self.mats = playground.get_mats()
+        self.static_layers = [not_active_cards.get_unused_cards(), not_active_cards.get_played_cards()]
+        self.layers = [playground.get_all_cards(), computer_player.get_cards(), human_player.get_cards()]
+        self.static_cards = card_sprite_list()
+        self.cards = card_sprite_list()
+        # Knows which cards move, without looking at every card
+        self.animator = animator
+        # The sums of the versions of the layers when the cards were put together, the versions only grow
+        self.static_version = -1
+        self.version = -1
+        # What the static part showed when it was drawn last, to tell if a cached copy is still right
+        self.drawn_static_state = None
+        self.was_static_moving = False
+
+        self.hint_label = arcade.Text("", config.start_x, config.bottom_y + config.card_height, LABEL_COLOR,
+                                      LABEL_SIZE)
+        self.computer_label = arcade.Text("", config.start_x, config.top_y - config.card_height * 1.5, LABEL_COLOR,
+                                          LABEL_SIZE)
+        self.trump_label = arcade.Text("", config.current_x - 2 * config.x_spacing,
+                                       config.bottom_y + config.card_height, LABEL_COLOR, LABEL_SIZE)
+
+    def update_cards(self):
+        """ Put the cards of the layers into the lists that are drawn, if any layer changed """
+        self.static_version = self.join_layers(self.static_layers, self.static_cards, self.static_version)
+        self.version = self.join_layers(self.layers, self.cards, self.version)
+
+    @staticmethod
+    def join_layers(layers, cards, joined_version):
+        """
+        :param layers: The sprite lists of the layers, the lowest first
+        :param cards: The sprite list that is drawn
+        :param joined_version: The sum of the versions of the layers when they were joined last
+        :return: The sum of the versions of the layers now
+        """
+        version = 0
+        for layer in layers:
+            version += layer.version
+        if version != joined_version:
+            cards.clear()
+            for layer in layers:
+                cards.extend(layer)
+        return version
+
+    def is_static_changed(self, hint_text, computer_text, trump_card_text):
+        """
+        :return: True if the static part looks different than when this was asked last
+        """
+        self.update_cards()
+        state = (self.static_version, len(self.mats), hint_text, computer_text, trump_card_text)
+        # A card that arrived on the pile has to be drawn once more where it stopped
+        is_moving = self.animator.is_any_moving(self.static_cards)
+        is_changed = state != self.drawn_static_state or is_moving or self.was_static_moving
+        self.drawn_static_state = state
+        self.was_static_moving = is_moving
+        return is_changed
+
+    @staticmethod
+    def draw_label(label, text):
+        # Setting the text lays it out again, so it is only set when it changed
+        if label.text != text:
+            label.text = text
+        label.draw()
+
+    def draw_static(self, hint_text, computer_text, trump_card_text):
+        """ Draw the mats, the talon, the discard pile and the labels """
+        self.mats.draw()
+        self.update_cards()
+        self.static_cards.draw()
+        self.draw_label(self.hint_label, hint_text)
+        self.draw_label(self.computer_label, computer_text)
+        self.draw_label(self.trump_label, trump_card_text)
+
+    def draw(self, hint_text, computer_text, trump_card_text):
+        """ Draw the mats, all cards and the labels """
+        self.draw_static(hint_text, computer_text, trump_card_text)
+        self.cards.draw()
+
+    def draw_cached(self, static_layer, hint_text, computer_text, trump_card_text):
+        """
+        Draw like draw, the static part is only drawn again into its layer when it changed
+        :param static_layer: The CachedLayer that keeps the static part
+        """
+        static_layer.fit_window()
+        if self.is_static_changed(hint_text, computer_text, trump_card_text) or static_layer.is_dirty:
+            with static_layer.activate():
+                static_layer.clear()
+                self.draw_static(hint_text, computer_text, trump_card_text)
+            static_layer.is_dirty = False
+        static_layer.draw()
+        self.cards.draw()
+
+    @staticmethod
+    def draw_playable_cards(cards):
+        """
+        Outline the cards the human may play, all outlines are drawn with one call
+        :param cards: The card sprites to outline
+        """
+        if len(cards) == 0:
+            return
+        lines = []
+        for card in cards:
+            hit_box = card.get_adjusted_hit_box()
+            for index in range(len(hit_box)):
+                lines.append(hit_box[index - 1])
+                lines.append(hit_box[index])
+        arcade.draw_lines(lines, arcade.color.YELLOW, 3)
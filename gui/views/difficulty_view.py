@@ -1,7 +1,7 @@
 import arcade
 import arcade.gui
 
-from Constants import EASY, MEDIUM, HARD
+from Constants import EASY, MEDIUM, HARD, EXPERT
 from gui.buttons.difficulty_button import DifficultyButton
 from gui.screen_configuration import ScreenConfiguration
 import gui.view_manager
@@ -36,11 +36,14 @@ class DifficultyView(arcade.View):
                                               screen_config=self.config)
         self.hard_button = DifficultyButton(button_text="Hard", manager=self.manager, mode=HARD,
                                             screen_config=self.config)
+        self.expert_button = DifficultyButton(button_text="Expert", manager=self.manager, mode=EXPERT,
+                                              screen_config=self.config)
 
         # Add to V_Box with spacing
         self.v_box.add(self.easy_button.with_space_around(bottom=self.scaling_y / 3))
         self.v_box.add(self.medium_button.with_space_around(bottom=self.scaling_y / 3))
-        self.v_box.add(self.hard_button)
+        self.v_box.add(self.hard_button.with_space_around(bottom=self.scaling_y / 3))
+        self.v_box.add(self.expert_button)
 
         # Create a widget to hold the v_box widget, that will center the buttons
         self.manager.add(
@@ -2,23 +2,33 @@ import arcade
 import arcade.gui
 from arcade import SpriteList
 
+from Constants import COMPUTER_AREA
+from game_logic.engine.random_streams import RandomStreams
 from game_logic.game_logic import GameLogic
 from gui.buttons.finish_move_buton import FinishMoveButton
 from gui.buttons.take_cards_button import TakeCardsButton
 from gui.card import Card
+from gui.card_animator import CardAnimator
+from gui.render_on_change import CachedLayer, RenderOnChange
 
 from play_areas.playground import Playground
 from play_areas.not_active_cards import NotActiveCards
 from play_areas.player_area import PlayerArea
 from gui.screen_configuration import ScreenConfiguration
+from gui.table_renderer import TableRenderer
 import gui.view_manager
 
 
 class GameView(arcade.View):
     """ Main application class. """
 
-    def __init__(self, screen_config: ScreenConfiguration, difficulty: int):
+    def __init__(self, screen_config: ScreenConfiguration, difficulty: int, seed=None):
+        """
+        :param seed: The seed of the game, the same seed deals the same cards. A new seed for every game if None.
+        """
         self.config = screen_config
+        self.seed = seed
+        self.streams = None
         super().__init__()
 
         self.view_manager = gui.view_manager.ViewManager()
@@ -47,6 +57,18 @@ class GameView(arcade.View):
         self.computer_player = PlayerArea(self.config.start_x_top, self.config.top_y,
                                           -self.config.x_spacing, self.config.current_x)
         self.not_active_cards = NotActiveCards(self.config)
+        # Moves every card of the game, one update per frame for all of them
+        self.animator = CardAnimator()
+        # Draws the areas in layers
+        self.renderer = TableRenderer(self.config, self.playground, self.not_active_cards, self.computer_player,
+                                      self.human_player, self.animator)
+        # In the render-on-change mode the frame is only drawn again when it changed, and the static part of the
+        # table only when that part changed
+        self.render_on_change = None
+        self.static_layer = None
+        if self.config.render_on_change:
+            self.render_on_change = RenderOnChange()
+            self.static_layer = CachedLayer()
 
         # Initialize the utils so we can use helper functions
         self.game_logic = GameLogic(self.human_player, self.computer_player, self.playground, self.not_active_cards,
@@ -91,83 +113,71 @@ class GameView(arcade.View):
         # init main playing area with one sprite
         self.playground.add_new_sprite()
 
+        # Every game owns its random numbers, so it can be replayed from its seed
+        self.streams = RandomStreams(self.seed)
+        self.not_active_cards.set_rng(self.streams.stream("played cards"))
+
         # Create every card
+        cards = {}
         for card_suit in self.config.card_suites:
             for card_value in self.config.card_values:
-                card = Card(card_suit, card_value, self.config.card_scale)
+                card = Card(card_suit, card_value, self.config.card_scale, self.animator)
                 card.position = self.config.start_x, self.config.middle_y
-                self.not_active_cards.add_new_card(card)
+                cards[card.code] = card
 
-        # Shuffle the unused_cards
-        self.not_active_cards.get_unused_cards().shuffle()
+        # Lay the cards out in the order of the shuffled deck of the game
+        for code in self.streams.deck():
+            self.not_active_cards.add_new_card(cards[code])
 
-        for index in range(0, 12):
-            card = self.not_active_cards.remove_last_card()
-            if index < 6:
-                card.face_up()
-                self.human_player.add_new_card(card)
-            else:
-                self.computer_player.add_new_card(card)
+        # Hand the shuffled deck to the rules engine, which deals the first cards
+        self.game_logic.start_game(list(self.not_active_cards.get_unused_cards()),
+                                   self.streams.stream("strategy", COMPUTER_AREA))
 
         # Pick the trump card
         trump_card: Card = self.not_active_cards.get_unused_cards()[0]
-        self.not_active_cards.set_trump_card(trump_card)
-        trump_card.face_up()
-        trump_card.angle = 90
-        trump_card.center_x = self.config.card_width * 1.2
+        self.not_active_cards.show_trump_card(trump_card)
         self.trump_card_text = "Trump:" + trump_card.suit
 
     def finish_turn(self):
-        if self.computer_player.is_taking:
-            self.game_logic.computer_take_cards()
-            self.computer_player.is_taking = False
-            self.human_player.is_turn = True
+        self.game_logic.finish_player_or_bot_turn()
 
-        elif self.human_player.is_turn:
-            self.human_player.is_turn = False
+    def mark_dirty(self):
+        """ Something on the screen changed, it has to be drawn again """
+        if self.render_on_change is not None:
+            self.render_on_change.mark_dirty()
 
-            self.game_logic.finish_turn()
+    def on_hide_view(self):
+        if self.render_on_change is not None:
+            self.render_on_change.wake_up()
 
     def on_draw(self):
         """ Render the screen. """
+        if self.render_on_change is not None:
+            # Without a change the last frame is shown again
+            self.render_on_change.draw(self.draw_scene)
+            return
+
         # Clear the screen
         self.clear()
+        self.draw_scene()
 
-        # Draw the mats for the main card area
-        self.playground.get_mats().draw()
-
-        # if any cards placed in the playground draw them
-        self.playground.get_all_cards().draw()
-
-        # draw not active cards
-        self.not_active_cards.get_unused_cards().draw()
-
-        # draw played cards
-        self.not_active_cards.get_played_cards().draw()
-
-        # draw computer_area cards
-        self.computer_player.get_cards().draw()
-
-        # draw the label
-        arcade.draw_text(self.hint_text, self.config.start_x, self.config.bottom_y + self.config.card_height,
-                         arcade.color.BLACK, 24)
-        # draw the label
-        arcade.draw_text(self.computer_text, self.config.start_x, self.config.top_y - (self.config.card_height * 1.5),
-                         arcade.color.BLACK, 24)
-
-        arcade.draw_text(self.trump_card_text, self.config.current_x - 2 * self.config.x_spacing,
-                         self.config.bottom_y + self.config.card_height,
-                         arcade.color.BLACK, 24)
+    def draw_scene(self):
+        # The mats, all cards and the labels
+        if self.static_layer is not None:
+            self.renderer.draw_cached(self.static_layer, self.hint_text, self.computer_text, self.trump_card_text)
+        else:
+            self.renderer.draw(self.hint_text, self.computer_text, self.trump_card_text)
 
         if self.show_btn:
             # Draw v_box with buttons
             self.manager.draw()
 
-        # draw player_area cards
-        self.human_player.get_cards().draw()
+        # Mark the cards the human may play
+        self.renderer.draw_playable_cards(self.game_logic.playable_cards)
 
     def on_mouse_press(self, x, y, button, key_modifiers):
         """ Called when the user presses a mouse button. """
+        self.mark_dirty()
 
         # Get list of cards we've clicked on
         cards: list[arcade.Sprite] = arcade.get_sprites_at_point((x, y), self.human_player.get_cards())
@@ -182,7 +192,7 @@ class GameView(arcade.View):
                 self.held_card.position = self.held_card.destination_point
 
             # Stop the animation
-            self.held_card.destination_point = self.held_card.position
+            self.held_card.stop_moving()
 
             # Get original position
             self.held_card_original_position = self.held_card.position
@@ -190,6 +200,7 @@ class GameView(arcade.View):
     def on_mouse_release(self, x: float, y: float, button: int,
                          modifiers: int):
         """ Called when the user presses a mouse button. """
+        self.mark_dirty()
 
         # If we don't have any unused_cards, who cares
         if not isinstance(self.held_card, Card):
@@ -219,7 +230,6 @@ class GameView(arcade.View):
 
             # remove card from human player_area
             self.human_player.remove_card(self.held_card)
-            self.human_player.is_turn = False
             self.show_btn = True
 
         # We are no longer holding unused_cards
@@ -227,25 +237,43 @@ class GameView(arcade.View):
 
     def on_mouse_motion(self, x: float, y: float, dx: float, dy: float):
         """ User moves mouse """
+        # The card follows the mouse and the buttons light up under it
+        self.mark_dirty()
         # If we are holding a card , move them with the mouse
         if isinstance(self.held_card, Card):
             self.held_card.center_x += dx
             self.held_card.center_y += dy
 
     def on_key_press(self, symbol: int, modifiers: int):
+        self.mark_dirty()
         if symbol == arcade.key.ESCAPE:
             self.view_manager.show_menu_view()
+        elif symbol == arcade.key.Z and modifiers & arcade.key.MOD_CTRL and not isinstance(self.held_card, Card):
+            # Take back the last move of the human, and with it the answer of the computer
+            if self.game_logic.undo():
+                self.show_btn = len(self.playground.get_all_cards()) > 0
+                self.computer_text = ""
 
     def on_update(self, delta_time: 1 / 150):
-        # Update the cards
-        self.human_player.get_cards().on_update(delta_time)
-        self.computer_player.get_cards().on_update(delta_time)
-        self.playground.get_all_cards().on_update(delta_time)
-        self.not_active_cards.get_played_cards().on_update(delta_time)
-
-        # Check if game is over
-        self.game_logic.game_over(self.view_manager, self.config)
-
-        self.show_btn, self.hint_text, self.computer_text = self.game_logic.on_update_logic(self.show_btn,
-                                                                                            self.hint_text,
-                                                                                            self.computer_text)
+        # Move all cards at once, by the time since the last frame
+        if self.animator.is_animating:
+            self.animator.update(delta_time)
+            self.mark_dirty()
+
+        # The logic only has to run if something happened since the last update or the computer is thinking
+        if self.game_logic.needs_update():
+            # A computer that is still thinking changes nothing on the screen
+            is_changed = self.game_logic.has_events()
+            texts = self.show_btn, self.hint_text, self.computer_text
+            self.show_btn, self.hint_text, self.computer_text = self.game_logic.on_update_logic(self.show_btn,
+                                                                                                self.hint_text,
+                                                                                                self.computer_text)
+            if is_changed or self.game_logic.has_events() or texts != (self.show_btn, self.hint_text,
+                                                                        self.computer_text):
+                self.mark_dirty()
+            # Check if game is over
+            self.game_logic.game_over(self.view_manager, self.config)
+
+        # A thinking computer needs the updates to finish its move in time
+        if self.render_on_change is not None and not self.game_logic.needs_update():
+            self.render_on_change.idle_if_clean()
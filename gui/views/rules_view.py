@@ -2,6 +2,7 @@ import os
 import arcade
 import arcade.gui
 import gui.view_manager
+from gui.render_on_change import RenderOnChange
 from gui.text_fields.rules import Rules
 from gui.screen_configuration import ScreenConfiguration
 
@@ -21,6 +22,9 @@ class RulesView(arcade.View):
         with open(f'{path}/Rules.txt', 'r', encoding='UTF-8') as f:
             self.__rules = f.read()
 
+        # Only draw the rules again when something changed
+        self.render_on_change = RenderOnChange() if self.config.render_on_change else None
+
         # --- Required for all code that uses UI element,
         # a UIManager to handle the UI.
         self.manager = arcade.gui.UIManager()
@@ -47,9 +51,35 @@ class RulesView(arcade.View):
         )
 
     def on_draw(self):
+        if self.render_on_change is not None:
+            self.render_on_change.draw(self.manager.draw)
+            return
         self.clear()
         self.manager.draw()
 
+    def on_update(self, delta_time: float):
+        if self.render_on_change is not None:
+            self.render_on_change.idle_if_clean()
+
+    def on_show_view(self):
+        # The view is shown again and again, the background color may have changed in between
+        self.mark_dirty()
+
+    def on_hide_view(self):
+        if self.render_on_change is not None:
+            self.render_on_change.wake_up()
+
+    def on_mouse_scroll(self, x: int, y: int, scroll_x: int, scroll_y: int):
+        # The rules scroll
+        self.mark_dirty()
+
+    def on_mouse_motion(self, x: float, y: float, dx: float, dy: float):
+        self.mark_dirty()
+
+    def mark_dirty(self):
+        if self.render_on_change is not None:
+            self.render_on_change.mark_dirty()
+
     def on_key_press(self, symbol: int, modifiers: int):
         if symbol == arcade.key.ESCAPE:
             view_manager = gui.view_manager.ViewManager()
@@ -4,6 +4,7 @@ import arcade.gui
 from gui.buttons.quit_button import QuitButton
 from gui.buttons.rules_button import RulesButton
 from gui.buttons.start_button import StartButton
+from gui.render_on_change import RenderOnChange
 from gui.screen_configuration import ScreenConfiguration
 
 
@@ -21,6 +22,8 @@ class StartView(arcade.View):
 
         self.rgb = [125, 1, 1]
         self.multiplier = 1
+        # Only draw the menu again when something changed, the background color stays the same then
+        self.render_on_change = RenderOnChange() if self.config.render_on_change else None
 
         # Set background color
         arcade.set_background_color(arcade.color.DARK_BLUE_GRAY)
@@ -48,6 +51,10 @@ class StartView(arcade.View):
         )
 
     def on_update(self, delta_time: 0.25):
+        if self.render_on_change is not None:
+            self.render_on_change.idle_if_clean()
+            return
+
         self.rgb[1] += self.multiplier * 2
         self.rgb[2] += self.multiplier * 4
         for f in self.rgb[1:]:
@@ -59,5 +66,26 @@ class StartView(arcade.View):
         arcade.set_background_color(self.rgb)
 
     def on_draw(self):
+        if self.render_on_change is not None:
+            self.render_on_change.draw(self.manager.draw)
+            return
         self.clear()
         self.manager.draw()
+
+    def on_hide_view(self):
+        if self.render_on_change is not None:
+            self.render_on_change.wake_up()
+
+    def on_mouse_motion(self, x: float, y: float, dx: float, dy: float):
+        # The buttons light up under the mouse
+        self.mark_dirty()
+
+    def on_mouse_press(self, x: float, y: float, button: int, modifiers: int):
+        self.mark_dirty()
+
+    def on_mouse_release(self, x: float, y: float, button: int, modifiers: int):
+        self.mark_dirty()
+
+    def mark_dirty(self):
+        if self.render_on_change is not None:
+            self.render_on_change.mark_dirty()
@@ -1,11 +1,20 @@
+import argparse
+
 import arcade
 
+from Constants import UPDATE_RATE
 from gui.screen_configuration import ScreenConfiguration
 from gui.view_manager import ViewManager
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Play Durak against the computer")
+    parser.add_argument("--render-on-change", action="store_true",
+                        help="only draw the screen when something changed, to save power")
+    args = parser.parse_args()
+
+    ScreenConfiguration.render_on_change = args.render_on_change
     config = ScreenConfiguration()
-    window = arcade.Window(config.width, config.height, config.screen_title, fullscreen=True)
+    window = arcade.Window(config.width, config.height, config.screen_title, fullscreen=True, update_rate=UPDATE_RATE)
     view_manager = ViewManager()
     view_manager.show_menu_view()
     arcade.run()
@@ -1,16 +1,18 @@
 import random
 
-import arcade
-
+from gui.card_animator import EASE_IN_OUT
+from gui.card_textures import card_sprite_list
 from gui.screen_configuration import ScreenConfiguration
 
 
 class NotActiveCards:
-    def __init__(self, config: ScreenConfiguration):
-        self.unused_cards = arcade.SpriteList()
-        self.played_cards = arcade.SpriteList()
+    def __init__(self, config: ScreenConfiguration, rng=None):
+        self.unused_cards = card_sprite_list()
+        self.played_cards = card_sprite_list()
         self.config = config
         self.trump_card = None
+        # The random stream for the positions of the played cards, the game view sets the stream of the game
+        self.rng = rng if rng is not None else random.Random()
 
     def get_played_cards(self):
         return self.played_cards
@@ -21,6 +23,16 @@ class NotActiveCards:
     def add_new_card(self, card):
         self.unused_cards.append(card)
 
+    def clear_unused_cards(self):
+        self.unused_cards.clear()
+
+    def return_card(self, card):
+        # Put a card back on top of the talon
+        card.face_down()
+        card.angle = 0
+        card.position = self.config.start_x, self.config.middle_y
+        self.unused_cards.append(card)
+
     # remove and return card from the list at index
     def remove_card(self, index):
         return self.unused_cards.pop(index)
@@ -34,17 +46,29 @@ class NotActiveCards:
             card.angle = 0
             return card
 
+    def set_rng(self, rng):
+        self.rng = rng
+
     def set_trump_card(self, card):
         self.trump_card = card
 
+    def show_trump_card(self, card):
+        # The trump card lies face up and turned at the bottom of the talon
+        self.set_trump_card(card)
+        card.face_up()
+        card.angle = 90
+        card.center_x = self.config.card_width * 1.2
+
+    def remove_played_card(self, card):
+        self.played_cards.remove(card)
+
     def add_played_card(self, card):
-        # Check if the angle is 0, if not, set it to a random angle
-        angle = random.randint(0, 3)
-        random_offset = random.randint(0, 5)
+        # The card turns on its way to the pile, by up to half a turn
+        angle = self.rng.randint(0, 3)
+        random_offset = self.rng.randint(0, 5)
         center_y = self.config.current_y / 2 + random_offset
         center_x = self.config.start_x + self.config.x_spacing * 2 + random_offset
-        card.change_angle = angle
-        card.destination_point = center_x, center_y
+        card.move_to((center_x, center_y), angle * 60, easing=EASE_IN_OUT)
 
         card.face_down()
         self.played_cards.append(card)
@@ -1,4 +1,4 @@
-import arcade
+from gui.card_textures import card_sprite_list
 
 
 class PlayerArea:
@@ -10,10 +10,7 @@ class PlayerArea:
         self.beginning_x_cfg = beginning_x
         self.beginning_x = self.beginning_x_cfg
         self.beginning_y = beginning_y
-        self.cards = arcade.SpriteList()
-        self.is_attacking = True
-        self.is_turn = True
-        self.is_taking = False
+        self.cards = card_sprite_list()
         self.bare_min = round(abs(self.current_x/self.x_spacing))
 
     def out_of_bound(self):
@@ -35,13 +32,19 @@ class PlayerArea:
     def new_pos_all(self):
 
         self.beginning_x = self.beginning_x_cfg
+        # Cards that are still on their way go straight to their new place
         for i in range(len(self.cards)):
-            self.cards[i].destination_point = self.beginning_x + i * self.x_spacing, self.beginning_y
+            self.cards[i].change_destination((self.beginning_x + i * self.x_spacing, self.beginning_y))
 
         self.beginning_x += len(self.cards)*self.x_spacing
     def get_cards(self):
         return self.cards
 
+    def clear(self):
+        self.cards.clear()
+        self.x_spacing = self.x_spacing_cfg
+        self.beginning_x = self.beginning_x_cfg
+
     def add_new_card(self, card):
         # card.position = self.beginning_x, self.beginning_y
         card.destination_point = self.beginning_x, self.beginning_y
@@ -64,7 +67,7 @@ class PlayerArea:
         move_position = self.beginning_x - self.x_spacing
         # Iterate backwards through the list
         for card in self.cards[card_index:][::-1]:
-            card.destination_point = move_position, self.beginning_y
+            card.change_destination((move_position, self.beginning_y))
             move_position -= self.x_spacing
 
     def find_card(self, card):
@@ -72,37 +75,3 @@ class PlayerArea:
             return self.cards.index(card)
         else:
             return None
-
-    def get_cards_with_same_suit_as_card(self, bottom_card):
-        # return list of unused_cards with same suit as bottom card
-        return [card for card in self.cards if card.suit == bottom_card.suit]
-
-    def get_cards_with_same_value_as_card(self, available_card):
-        # Create empty set
-        cards_with_same_value = set()
-        # Add all unused_cards with same value to set
-        for card in self.cards:
-            if card.value == available_card.value:
-                cards_with_same_value.add(card)
-
-        return cards_with_same_value
-
-    def get_cards_with_same_value_int(self, value):
-        # Create empty set
-        cards_with_same_value = set()
-        # Add all cards with same value to set
-        for card in self.cards:
-            if card.value == value:
-                cards_with_same_value.add(card)
-
-        return cards_with_same_value
-
-    def get_cards_with_same_suit_str(self, suit):
-        # Create empty set
-        cards_with_same_suit = set()
-        # Add all cards with same suit to set
-        for card in self.cards:
-            if card.suit == suit:
-                cards_with_same_suit.add(card)
-
-        return cards_with_same_suit
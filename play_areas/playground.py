@@ -1,5 +1,6 @@
 import arcade
 
+from gui.card_textures import card_sprite_list
 from gui.screen_configuration import ScreenConfiguration
 
 
@@ -9,8 +10,10 @@ class Playground:
         self.mat_list = arcade.SpriteList()
         self.start_x_position = self.config.current_x / 2
         self.cards = []
+        # All cards on the table in one persistent list, so drawing and updating them does not rebuild a list
+        self.all_cards = card_sprite_list()
 
-    def get_cards(self) -> [arcade.SpriteList()]:
+    def get_cards(self) -> [list]:
         return self.cards
 
     def add_new_sprite(self):
@@ -18,16 +21,19 @@ class Playground:
         mat.position = self.start_x_position, self.config.middle_y
         self.start_x_position += self.config.x_spacing
         self.mat_list.append(mat)
-        self.cards.append(arcade.SpriteList())
+        # The cards of a mat are only counted, they are drawn from all_cards
+        self.cards.append([])
 
     def add_new_card(self, card):
         if len(self.cards[-1]) == 0:
             card.destination_point = self.mat_list[-1].center_x, self.mat_list[-1].center_y
             self.cards[-1].append(card)
+            self.all_cards.append(card)
 
         elif len(self.cards[-1]) == 1:
             card.destination_point = self.mat_list[-1].center_x, self.mat_list[-1].center_y - self.config.card_height / 4
             self.cards[-1].append(card)
+            self.all_cards.append(card)
 
     def get_bottom_card(self):
         return self.cards[-1][0]
@@ -36,18 +42,12 @@ class Playground:
         return self.mat_list
 
     def get_all_cards(self):
-        lst = arcade.SpriteList()
-        for card_pair in self.cards:
-            for card in card_pair:
-                lst.append(card)
-        return lst
+        return self.all_cards
 
     def get_and_remove_all_cards(self):
-        lst = []
-        for card_pair in self.cards:
-            for card in card_pair:
-                lst.append(card)
+        lst = list(self.all_cards)
 
+        self.all_cards.clear()
         self.cards.clear()
         self.mat_list.clear()
         self.start_x_position = self.config.current_x / 2
@@ -0,0 +1,56 @@
+import argparse
+import time
+
+from Constants import PLAYER_AREA, COMPUTER_AREA
+from game_logic.self_play import STRATEGIES, run_match, play_seeded_game
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Let two computer strategies play Durak against each other")
+    parser.add_argument("first", choices=STRATEGIES.keys(), help="strategy of the first player")
+    parser.add_argument("second", choices=STRATEGIES.keys(), help="strategy of the second player")
+    parser.add_argument("-n", "--games", type=int, default=10000, help="number of games to play")
+    parser.add_argument("-s", "--seed", type=int, default=0, help="seed of the first game")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="number of worker processes")
+    parser.add_argument("-b", "--batch-size", type=int, default=1000, help="games per worker batch")
+    parser.add_argument("-c", "--decision-cache", action="store_true",
+                        help="remember the moves of the rule based strategies")
+    parser.add_argument("--batched", action="store_true",
+                        help="play the games in lockstep with NumPy arrays, only for easy against easy")
+    parser.add_argument("--record", default=None,
+                        help="append every game to the game record with this path, without the file suffixes")
+    parser.add_argument("-r", "--replay", type=int, default=None, help="only replay the game with this seed")
+    parser.add_argument("--seat", type=int, choices=(PLAYER_AREA, COMPUTER_AREA), default=PLAYER_AREA,
+                        help="seat of the first strategy in the replayed game")
+    args = parser.parse_args()
+    if args.replay is not None:
+        start_time = time.perf_counter()
+        winner, turns = play_seeded_game(STRATEGIES[args.first], STRATEGIES[args.second], args.replay, args.seat)
+        print(f"{args.first} vs {args.second}, seed {args.replay}, seat {args.seat}")
+        if winner is None:
+            print("draw")
+        else:
+            print(f"winner: {args.first if winner == args.seat else args.second}")
+        print(f"turns: {turns}")
+        print(f"seconds: {time.perf_counter() - start_time:.3f}")
+        parser.exit()
+    if args.batched and (args.first, args.second) != ("easy", "easy"):
+        parser.error("--batched only works for easy against easy")
+    if args.batched and args.record is not None:
+        parser.error("--batched games can't be recorded")
+
+    stats, elapsed = run_match(args.first, args.second, args.games, args.seed, args.workers, args.batch_size,
+                               args.decision_cache, args.batched, args.record)
+
+    print(f"{args.first} vs {args.second}: {stats.games} games")
+    print(f"wins:   {stats.wins / stats.games:.2%}")
+    print(f"losses: {stats.losses / stats.games:.2%}")
+    print(f"draws:  {stats.draws / stats.games:.2%}")
+    print(f"average turns: {stats.average_turns:.2f}")
+    print(f"games per second: {stats.games / elapsed:.0f}")
+    if stats.table_probes > 0:
+        print(f"transposition table: {stats.table_hit_rate:.2%} hits, {stats.table_occupancy:.2%} full")
+    if stats.cache_lookups > 0:
+        print(f"decision cache: {stats.cache_hit_rate:.2%} hits")
+    seconds, seed, seat = stats.slowest_game
+    if seed is not None:
+        print(f"slowest game: {seconds:.3f} seconds, replay with --replay {seed} --seat {seat}")
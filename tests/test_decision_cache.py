@@ -0,0 +1,55 @@
+import unittest
+
+from Constants import MAX_TURNS
+from game_logic.self_play import STRATEGIES, setup_game
+from game_logic.strategies.decision_cache import DecisionCache
+
+
+def compare_decisions(test, first_name, second_name, games):
+    """
+    Play games in which every cached decision is compared with the decision the strategy computes itself
+    :return: The number of decisions that were looked up in the cache
+    """
+    cache = DecisionCache()
+    lookups = 0
+    for seed in range(games):
+        engine, contexts = setup_game(STRATEGIES[first_name], STRATEGIES[second_name], seed, seed % 2, cache)
+        while not engine.is_over and engine.turns < MAX_TURNS:
+            seat = engine.to_move
+            context = contexts[seat]
+            is_attack = seat != engine.defender
+            before = cache.lookups
+            card = context.pick_card(is_attack, context.strategy)
+            if cache.lookups > before:
+                lookups += 1
+                test.assertEqual(card, context.compute_decision(is_attack, context.strategy),
+                                 f"game {seed}, turn {engine.turns}")
+            if context.play_card(card, is_attack) is None:
+                if is_attack:
+                    engine.finish_turn()
+                else:
+                    engine.take(seat)
+    return lookups
+
+
+class DecisionCacheTest(unittest.TestCase):
+
+    def test_cached_medium_decisions_match(self):
+        self.assertGreater(compare_decisions(self, "medium", "medium", 3000), 0)
+
+    def test_cached_hard_decisions_match(self):
+        self.assertGreater(compare_decisions(self, "hard", "medium", 1500), 0)
+
+    def test_least_recently_used_is_forgotten(self):
+        cache = DecisionCache(size=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        self.assertEqual(cache.get("a"), 1)
+        cache.put("c", 3)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), 1)
+        self.assertEqual(cache.evictions, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import unittest
+
+from Constants import MAX_TURNS
+from game_logic.self_play import STRATEGIES, setup_game
+from game_logic.strategies.endgame_solver import EndgameSolver
+from game_logic.strategies.transposition_table import TranspositionTable
+
+
+def minimax(engine, seat):
+    """
+    :return: The value of the game for the seat, found by trying every move with both hands known
+    """
+    if engine.is_over:
+        if engine.is_draw:
+            return 0
+        return 1 if engine.winner == seat else -1
+    values = []
+    for move in engine.legal_moves():
+        child = engine.copy()
+        child.apply_move(move)
+        values.append(minimax(child, seat))
+    return max(values) if engine.to_move == seat else min(values)
+
+
+class EndgameSolverTest(unittest.TestCase):
+
+    def test_best_move_is_optimal(self):
+        # Small endgames, so every move can be tried
+        solver = EndgameSolver(max_cards=7, time_budget=60, transposition_table=TranspositionTable(1 << 12))
+        positions = 0
+        for seed in range(60):
+            engine, contexts = setup_game(STRATEGIES["easy"], STRATEGIES["easy"], seed)
+            while not engine.is_over and engine.turns < MAX_TURNS:
+                seat = engine.to_move
+                move = solver.best_move(engine, seat)
+                if move is None:
+                    move = engine.legal_moves()[0]
+                else:
+                    positions += 1
+                    child = engine.copy()
+                    child.apply_move(move)
+                    self.assertEqual(minimax(child, seat), minimax(engine, seat), f"game {seed}, turn {engine.turns}")
+                engine.apply_move(move)
+        self.assertGreater(positions, 100)
+
+    def test_best_move_survives_a_full_table(self):
+        # With two slots the entry of the root position is replaced during almost every search
+        solver = EndgameSolver(max_cards=8, time_budget=60, transposition_table=TranspositionTable(2))
+        searches = 0
+        for seed in range(40):
+            engine, contexts = setup_game(STRATEGIES["easy"], STRATEGIES["easy"], seed)
+            while not engine.is_over and engine.turns < MAX_TURNS:
+                seat = engine.to_move
+                moves = engine.legal_moves()
+                move = solver.best_move(engine, seat)
+                if move is not None:
+                    searches += 1
+                    self.assertIn(move, moves, f"game {seed}, turn {engine.turns}")
+                else:
+                    self.assertFalse(solver.can_solve(engine), f"game {seed}, turn {engine.turns}")
+                    move = moves[0]
+                engine.apply_move(move)
+        self.assertGreater(searches, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+import os
+import tempfile
+import unittest
+
+from Constants import PLAYER_AREA
+from game_logic.game_record import GameRecordReader, GameRecordWriter, encode_move
+from game_logic.self_play import STRATEGIES, play_game, setup_game
+
+
+class GameRecordTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "record")
+        # A few real games, so every record can be replayed
+        self.games = []
+        with GameRecordWriter(self.path) as writer:
+            for seed in range(5):
+                engine, contexts = setup_game(STRATEGIES["easy"], STRATEGIES["medium"], seed, PLAYER_AREA)
+                moves = bytearray()
+                winner = play_game(engine, contexts, moves)
+                writer.append(seed, engine.trump_card, winner, bytes(moves))
+                self.games.append((seed, winner, bytes(moves)))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_records_round_trip(self):
+        with GameRecordReader(self.path) as reader:
+            self.assertEqual(len(reader), len(self.games))
+            for record, (seed, winner, moves) in zip(reader, self.games):
+                self.assertEqual(record.seed, seed)
+                self.assertEqual(record.winner, -1 if winner is None else winner)
+                self.assertEqual(record.moves, moves)
+
+    def test_record_outlives_reader(self):
+        with GameRecordReader(self.path) as reader:
+            longest = max(reader, key=lambda record: len(record.moves))
+        self.assertEqual(longest.moves, max((moves for _, _, moves in self.games), key=len))
+        # The record replays without the reader
+        for engine, move in longest.replay():
+            pass
+        self.assertTrue(engine.is_over)
+
+    def test_arrays_outlive_reader(self):
+        with GameRecordReader(self.path) as reader:
+            games, moves = reader.arrays()
+        self.assertEqual(games["seed"].tolist(), [seed for seed, _, _ in self.games])
+        self.assertEqual(moves.tobytes(), b"".join(moves for _, _, moves in self.games))
+
+    def test_encode_move_fits_a_byte(self):
+        for kind in range(4):
+            for card in range(36):
+                self.assertLess(encode_move(kind, card), 256)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import unittest
+
+from game_logic.tournament import H0_ACCEPTED, H1_ACCEPTED, PairStats, elo_to_score, score_to_elo
+
+
+def pair_stats(*pairs):
+    """
+    :param pairs: (scores, count) tuples, the scores of the first strategy in both games and how many pairs had them
+    :return: The PairStats of all pairs
+    """
+    stats = PairStats()
+    for scores, count in pairs:
+        for _ in range(count):
+            stats.add_pair(scores)
+    return stats
+
+
+class EloTest(unittest.TestCase):
+
+    def test_even_score_is_zero_elo(self):
+        self.assertEqual(elo_to_score(0), 0.5)
+        self.assertEqual(score_to_elo(0.5), 0)
+
+    def test_known_score(self):
+        # A score of 3:1 is 400 * log10(3) Elo
+        self.assertAlmostEqual(score_to_elo(0.75), 190.8485, places=4)
+        self.assertAlmostEqual(elo_to_score(190.8485), 0.75, places=6)
+
+
+class PairStatsTest(unittest.TestCase):
+
+    def test_split_pairs_give_zero_elo(self):
+        # Every deck is won once from each seat
+        stats = pair_stats(((1, 0), 40), ((0, 1), 60))
+        self.assertEqual((stats.wins, stats.draws, stats.losses), (100, 0, 100))
+        self.assertEqual(stats.games, 200)
+        self.assertEqual(stats.score, 0.5)
+        self.assertEqual(stats.elo, 0)
+        self.assertEqual(stats.variance, 0)
+        self.assertEqual(stats.elo_interval(), (0, 0))
+        # Without variance the test can't tell the hypotheses apart
+        self.assertEqual(stats.llr(0, 20), 0)
+        self.assertIsNone(stats.sprt(0, 20, 0.05, 0.05))
+
+    def test_draws_score_half(self):
+        stats = pair_stats(((0.5, 0.5), 10), ((1, 0.5), 10))
+        self.assertEqual((stats.wins, stats.draws, stats.losses), (10, 30, 0))
+        self.assertAlmostEqual(stats.score, 0.625)
+
+    def test_elo_interval(self):
+        # 30 pairs won twice, 40 split and 30 lost twice: a score of 0.5 with a variance of 0.15 per pair
+        stats = pair_stats(((1, 1), 30), ((1, 0), 40), ((0, 0), 30))
+        self.assertEqual(stats.elo, 0)
+        self.assertAlmostEqual(stats.variance, 0.15)
+        lower, upper = stats.elo_interval(1.96)
+        self.assertAlmostEqual(upper, 53.159, places=3)
+        self.assertAlmostEqual(lower, -53.159, places=3)
+
+    def test_llr_and_sprt(self):
+        # 60% of the pairs won twice and 40% lost twice: a score of 0.6 with a variance of 0.24 per pair. The bounds
+        # of the SPRT with alpha = beta = 0.05 are +-log(19) = +-2.944.
+        stats = pair_stats(((1, 1), 60), ((0, 0), 40))
+        self.assertEqual((stats.wins, stats.draws, stats.losses), (120, 0, 80))
+        self.assertAlmostEqual(stats.variance, 0.24)
+        self.assertAlmostEqual(stats.llr(0, 20), 1.02573, places=5)
+        self.assertIsNone(stats.sprt(0, 20, 0.05, 0.05))
+
+        # Three times as many pairs with the same scores cross the upper bound
+        stats.merge(pair_stats(((1, 1), 120), ((0, 0), 80)))
+        self.assertEqual(stats.pairs, 300)
+        self.assertAlmostEqual(stats.llr(0, 20), 3.07720, places=5)
+        self.assertEqual(stats.sprt(0, 20, 0.05, 0.05), H1_ACCEPTED)
+
+        # The same number of pairs with the scores swapped cross the lower bound
+        stats = pair_stats(((1, 1), 120), ((0, 0), 180))
+        self.assertAlmostEqual(stats.llr(0, 20), -4.11044, places=5)
+        self.assertEqual(stats.sprt(0, 20, 0.05, 0.05), H0_ACCEPTED)
+
+    def test_no_pairs(self):
+        stats = PairStats()
+        self.assertEqual(stats.score, 0.5)
+        self.assertIsNone(stats.sprt())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,37 @@
+import argparse
+
+from Constants import SPRT_ELO0, SPRT_ELO1, SPRT_ALPHA, SPRT_BETA
+from game_logic.self_play import STRATEGIES
+from game_logic.tournament import H0_ACCEPTED, H1_ACCEPTED, run_tournament
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Compare two computer strategies with duplicate deals and a SPRT")
+    parser.add_argument("first", choices=STRATEGIES.keys(), help="strategy of the first player")
+    parser.add_argument("second", choices=STRATEGIES.keys(), help="strategy of the second player")
+    parser.add_argument("-n", "--pairs", type=int, default=10000, help="maximum number of decks, each is played twice")
+    parser.add_argument("-s", "--seed", type=int, default=0, help="seed of the first deck")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="number of worker processes")
+    parser.add_argument("-b", "--batch-size", type=int, default=100, help="pairs per worker batch")
+    parser.add_argument("--elo0", type=float, default=SPRT_ELO0, help="Elo difference of the null hypothesis")
+    parser.add_argument("--elo1", type=float, default=SPRT_ELO1, help="Elo difference of the alternative hypothesis")
+    parser.add_argument("--alpha", type=float, default=SPRT_ALPHA, help="chance of a false H1")
+    parser.add_argument("--beta", type=float, default=SPRT_BETA, help="chance of a false H0")
+    args = parser.parse_args()
+
+    stats, result, elapsed = run_tournament(args.first, args.second, args.pairs, args.seed, args.workers,
+                                            args.batch_size, args.elo0, args.elo1, args.alpha, args.beta)
+
+    lower, upper = stats.elo_interval()
+    print(f"{args.first} vs {args.second}: {stats.pairs} decks, {stats.games} games")
+    print(f"wins: {stats.wins}, losses: {stats.losses}, draws: {stats.draws}")
+    print(f"pair scores 0-2: {stats.pair_counts}")
+    print(f"score: {stats.score:.2%}")
+    print(f"elo: {stats.elo:+.1f} [{lower:+.1f}, {upper:+.1f}]")
+    print(f"llr: {stats.llr(args.elo0, args.elo1):.2f}")
+    if result == H1_ACCEPTED:
+        print(f"SPRT: H1 accepted, {args.first} is at least {args.elo1:g} elo stronger")
+    elif result == H0_ACCEPTED:
+        print(f"SPRT: H0 accepted, {args.first} is not more than {args.elo0:g} elo stronger")
+    else:
+        print("SPRT: no decision")
+    print(f"games per second: {stats.games / elapsed:.0f}")